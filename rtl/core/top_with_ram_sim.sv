@@ -17,7 +17,11 @@ module top_with_ram_sim #(
     parameter string     IMEM_INIT_FILE = "",            // IMEM initialization file (optional)
     parameter string     DMEM_INIT_FILE = ""             // DMEM initialization file (optional)
   ) (
+`ifdef RVCORE_INTERNAL_CLOCK
+    output logic clk,  // Generated below; observed by the testbench
+`else
     input logic clk,
+`endif
     input logic reset_n,
 
     // Control/status
@@ -64,6 +68,17 @@ module top_with_ram_sim #(
 
   );
 
+`ifdef RVCORE_INTERNAL_CLOCK
+  // =================================================================
+  //  Simulation Clock (requires Verilator --timing)
+  // =================================================================
+`ifndef RVCORE_CLK_HALF_PERIOD_NS
+`define RVCORE_CLK_HALF_PERIOD_NS 5
+`endif
+  initial clk = 1'b0;
+  always #(`RVCORE_CLK_HALF_PERIOD_NS) clk = ~clk;
+
+`endif
   // =================================================================
   //  Internal Memory Parameters and Address Mapping
   // =================================================================
@@ -0,0 +1,140 @@
+"""Constants and DUT bring-up shared by the top_with_ram_sim trigger tests.
+
+Used by test_sdtrig_extended and test_trigger_actions.
+"""
+import os
+
+import cocotb
+from cocotb.triggers import ClockCycles, FallingEdge, RisingEdge
+from cocotb.clock import Clock
+
+# CSR addresses
+CSR_TSELECT = 0x7A0
+CSR_TDATA1 = 0x7A1
+CSR_TDATA2 = 0x7A2
+CSR_TDATA3 = 0x7A3
+CSR_TINFO = 0x7A4
+CSR_TCONTROL = 0x7A5
+CSR_MCONTEXT = 0x7A8
+
+# Trigger types
+TRIGGER_TYPE_MCONTROL = 0x2
+TRIGGER_TYPE_ICOUNT = 0x3
+TRIGGER_TYPE_ITRIGGER = 0x4
+TRIGGER_TYPE_ETRIGGER = 0x5
+TRIGGER_TYPE_MCONTROL6 = 0x6
+TRIGGER_TYPE_TMEXTTRIGGER = 0x7
+
+# tmexttrigger: input 0 -> action 8 (o_external_trigger[0]),
+#               input 1 -> action 9 (o_external_trigger[1])
+TDATA1_EXT0 = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (0 << 16) | (8 << 12)
+TDATA1_EXT1 = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (1 << 16) | (9 << 12)
+
+DEFAULT_CLK_PERIOD_NS = 10
+DEFAULT_RESET_CYCLES = 5
+
+# rvcore_simple proc_state value in which CSR writes commit
+PROC_STATE_IMEM_DONE = 2
+# Register csr_write loads the write value into (restored afterwards)
+CSR_SCRATCH_REG = 31
+CSR_WRITE_TIMEOUT_CYCLES = 50
+
+# Set by the Makefile when the RTL generates its own clock (HDL_CLOCK=1)
+HDL_CLOCK = os.getenv("RVCORE_HDL_CLOCK", "0") == "1"
+
+# Input values driven by init_dut while reset is asserted
+_INIT_SIGNALS = (
+    ("reset_n", 0),
+    ("dmem_wready", 1),
+    ("dmem_rvalid", 0),
+    ("imem_rvalid", 1),
+    ("i_haltreq", 0),
+    ("i_external_trigger", 0),
+)
+
+
+async def init_dut(dut, clk_period_ns=None, reset_cycles=None):
+    """Initialize DUT with clock and reset."""
+    if clk_period_ns is None:
+        clk_period_ns = DEFAULT_CLK_PERIOD_NS
+    if reset_cycles is None:
+        reset_cycles = DEFAULT_RESET_CYCLES
+
+    if not HDL_CLOCK:
+        cocotb.start_soon(Clock(dut.clk, clk_period_ns, units="ns").start())
+
+    for name, value in _INIT_SIGNALS:
+        getattr(dut, name).value = value
+
+    await ClockCycles(dut.clk, reset_cycles)
+    dut.reset_n.value = 1
+    await ClockCycles(dut.clk, 2)
+
+    # Last index written by select_trigger, kept per DUT (tselect resets to 0)
+    dut.cpu._tselect = 0
+
+
+def select_trigger(cpu, idx):
+    """Point cpu.tselect at trigger idx, skipping the write if already there.
+
+    Only valid while select_trigger is the sole writer of tselect after
+    init_dut.
+    """
+    if getattr(cpu, "_tselect", None) != idx:
+        cpu.tselect.value = idx
+        cpu._tselect = idx
+
+
+def set_trigger(cpu, idx, tdata1, tdata2=None):
+    """Select trigger idx and write its tdata1 (and tdata2 if given)."""
+    select_trigger(cpu, idx)
+    cpu.tdata1[idx].value = tdata1
+    if tdata2 is not None:
+        cpu.tdata2[idx].value = tdata2
+
+
+def encode_csrrw(rd, csr, rs1):
+    """Encode CSRRW rd, csr, rs1."""
+    return (csr << 20) | (rs1 << 15) | (0x1 << 12) | (rd << 7) | 0x73
+
+
+async def csr_write(dut, csr, value, timeout_cycles=None):
+    """Write a CSR through the core's CSR write path.
+
+    At the next IMEM_DONE the fetched instruction is replaced by
+    ``csrrw x0, csr, x31`` with x31 holding value, so the write goes through
+    the same decode, write-data and write-enable logic as firmware. The
+    replaced instruction is skipped and x31 is restored afterwards.
+    """
+    if timeout_cycles is None:
+        timeout_cycles = CSR_WRITE_TIMEOUT_CYCLES
+    cpu = dut.cpu
+
+    for _ in range(timeout_cycles):
+        await FallingEdge(dut.clk)
+        if int(cpu.proc_state.value) == PROC_STATE_IMEM_DONE:
+            break
+    else:
+        assert False, f"core did not reach IMEM_DONE within {timeout_cycles} cycles"
+
+    scratch = cpu.register_file[CSR_SCRATCH_REG]
+    saved = int(scratch.value)
+    scratch.value = value
+    cpu.inst.value = encode_csrrw(0, csr, CSR_SCRATCH_REG)
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    scratch.value = saved
+
+
+async def check_csr(dut, csr, sig, wval, expected, rmask=0xFFFFFFFF):
+    """Write wval to a CSR with csr_write and check the masked value of sig.
+
+    sig is the register the write lands in. Returns the full value read back.
+    """
+    await csr_write(dut, csr, wval)
+    rval = int(sig.value)
+    assert rval & rmask == expected, (
+        f"{sig._name}: wrote 0x{wval:08x}, expected 0x{expected:08x} "
+        f"under mask 0x{rmask:08x}, got 0x{rval:08x}"
+    )
+    return rval
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Fail when a PROFILE=1 run made more Python calls than a baseline run
+
+Compares the total function call count of two cProfile outputs. Call counts
+do not depend on host load the way wall time does, so the check can gate a
+testbench change.
+
+Usage: python3 check_profile.py test_profile.pstat baseline.pstat [max_increase]
+
+max_increase is the allowed relative growth (default 0.10, i.e. 10%).
+"""
+
+import sys
+import pstats
+
+DEFAULT_MAX_INCREASE = 0.10
+
+
+def total_calls(pstat_file):
+    """Return the total number of function calls recorded in pstat_file"""
+    return pstats.Stats(pstat_file).total_calls
+
+
+def check_profile(current_file, baseline_file, max_increase=DEFAULT_MAX_INCREASE):
+    """Return True if current_file stays within max_increase of baseline_file"""
+    current = total_calls(current_file)
+    baseline = total_calls(baseline_file)
+    limit = int(baseline * (1 + max_increase))
+
+    print(f"Function calls: {current} (baseline {baseline}, limit {limit})")
+    if current > limit:
+        print(f"Profile regression: {current - baseline:+d} calls "
+              f"({(current - baseline) / baseline:+.1%})", file=sys.stderr)
+        return False
+    return True
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (3, 4):
+        print(f"Usage: {sys.argv[0]} test_profile.pstat baseline.pstat [max_increase]",
+              file=sys.stderr)
+        sys.exit(2)
+
+    max_increase = float(sys.argv[3]) if len(sys.argv) == 4 else DEFAULT_MAX_INCREASE
+
+    try:
+        ok = check_profile(sys.argv[1], sys.argv[2], max_increase)
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(0 if ok else 1)
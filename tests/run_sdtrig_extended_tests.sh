@@ -20,7 +20,8 @@ make clean-local > /dev/null 2>&1 || true
 rm -f results.xml
 
 # Run with explicit module and avoid default targets
-MODULE=test_sdtrig_extended TESTCASE="" make -f Makefile results.xml
+# (HDL_CLOCK=1 generates the clock inside the RTL)
+MODULE=test_sdtrig_extended TESTCASE="" make -f Makefile results.xml HDL_CLOCK=${HDL_CLOCK:-0}
 
 # Check results
 echo ""
@@ -36,9 +36,10 @@ export COMPILE_ARGS="${COMPILE_ARGS} -GSTART_ADDR=32\\'h00000000 -GHART_ID=0"
 export COCOTB_REDUCED_LOG_FMT=1
 export COCOTB_LOG_LEVEL=INFO
 
-# Waveform control
+# Waveform control (off by default; FST is much faster to write than VCD)
 if [ "${WAVES}" = "1" ]; then
-    export EXTRA_ARGS="--trace --trace-structs"
+    export EXTRA_ARGS="--trace-fst --trace-structs"
+    echo "Waveform generation enabled (dump.fst)"
 fi
 
 # Clean previous build
@@ -0,0 +1,228 @@
+"""Launch cocotb testcases from pytest.
+
+Helpers used by the *_pytest.py modules to run one cocotb testcase per
+pytest item, so independent tests can be spread over processes with
+pytest-xdist (``pytest -n auto``).
+
+Build directories are keyed by a hash of the RTL sources and build options,
+so unchanged RTL is never re-elaborated across runs, and each xdist worker
+builds into its own directory, so workers never race on Verilator artifacts.
+Within one worker the build step runs once per configuration.
+"""
+import ast
+import hashlib
+import os
+from pathlib import Path
+
+try:
+    from cocotb_tools.runner import get_results, get_runner
+except ImportError:  # cocotb 1.x
+    from cocotb.runner import get_results, get_runner
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = TESTS_DIR.parent
+RTL_DIR = PROJECT_ROOT / "rtl" / "core"
+DEPS_DIR = PROJECT_ROOT / "deps"
+
+# top_with_ram_sim RTL modules and the dependency sources it pulls in
+_TOP_MODULES = [
+    RTL_DIR / "alu_module.sv",
+    RTL_DIR / "apb_arbiter.sv",
+    RTL_DIR / "cf_math_pkg.sv",
+    RTL_DIR / "clint.sv",
+    RTL_DIR / "decoder_module.sv",
+    RTL_DIR / "rvcore_simple.sv",
+    RTL_DIR / "top_with_ram_sim.sv",
+    RTL_DIR / "trigger_module_comb.sv",
+    RTL_DIR / "trigger_module.sv",
+]
+
+_TOP_DEPS = [
+    DEPS_DIR / "apb" / "src" / "apb_pkg.sv",
+    DEPS_DIR / "apb" / "src" / "apb_intf.sv",
+    DEPS_DIR / "apb_uart_sv" / "apb_uart.sv",
+    DEPS_DIR / "apb_uart_sv" / "uart_rx.sv",
+    DEPS_DIR / "apb_uart_sv" / "uart_tx.sv",
+    DEPS_DIR / "apb_uart_sv" / "uart_interrupt.sv",
+    DEPS_DIR / "apb_uart_sv" / "io_generic_fifo.sv",
+]
+
+# top_with_ram_sim sources (VERILOG_SOURCES in Makefile.clint, checked by
+# test_sim_runner_sync.py)
+TOP_WITH_RAM_SIM_SOURCES = [
+    *_TOP_MODULES,
+    *sorted(RTL_DIR.glob("*.svh")),
+    *_TOP_DEPS,
+]
+
+TOP_WITH_RAM_SIM_INCLUDES = [
+    RTL_DIR,
+    DEPS_DIR / "apb" / "src",
+    DEPS_DIR / "apb" / "include",
+]
+
+# Bare core sources (keep in sync with run_sdtrig_tests.sh)
+CORE_SOURCES = [
+    RTL_DIR / "rvcore_simple.sv",
+    RTL_DIR / "cf_math_pkg.sv",
+]
+
+CORE_INCLUDES = [RTL_DIR]
+
+# Verilator options of Makefile.clint (checked by test_sim_runner_sync.py)
+VERILATOR_BUILD_ARGS = [
+    "-Wno-WIDTHTRUNC",
+    "-Wno-WIDTHEXPAND",
+    "-Wno-CASEINCOMPLETE",
+    "-Wno-CASEX",
+    "-Wno-TIMESCALEMOD",
+    "-Wno-PINMISSING",
+    "-Wno-MULTIDRIVEN",
+    "-Wno-UNOPTFLAT",
+    "-Wno-MODDUP",
+    "-Wno-IMPLICITSTATIC",
+    "-Wno-IMPLICIT",
+    "-Wno-ALWCOMBORDER",
+    "-Wno-LATCH",
+    "-Wno-DECLFILENAME",
+    "--x-assign", "unique",
+    "--x-initial", "unique",
+]
+
+# Build settings of the main Makefile flow (test_sdtrig_extended,
+# test_trigger_actions) with its defaults (HDL_CLOCK=0).
+# Checked against tests/Makefile by test_sim_runner_sync.py.
+MAKEFILE_SOURCES = [
+    *_TOP_MODULES,
+    *sorted(RTL_DIR.glob("*.vh")),
+    *sorted(RTL_DIR.glob("*.svh")),
+    *_TOP_DEPS,
+]
+
+MAKEFILE_INCLUDES = [RTL_DIR, DEPS_DIR / "apb" / "src"]
+
+MAKEFILE_PARAMETERS = {
+    "START_ADDR": 0x00010000,
+    # Overridable from the environment, like TOHOST_ADDR ?= in the Makefile
+    "TOHOST_ADDR": int(os.getenv("TOHOST_ADDR", "000106C0"), 16),
+    "UART_BASE_ADDR": 0x00000100,
+    "UART_ADDR_MASK": 0x00000FF0,
+}
+
+MAKEFILE_DEFINES = {
+    "CLINT_BASE": "32'h02000000",
+    "CLINT_END": "32'h0200FFFF",
+    "DEBUG_AREA_START": "32'h00000000",
+    "DEBUG_AREA_END": "32'h00001000",
+}
+
+MAKEFILE_BUILD_ARGS = [
+    "-Wno-fatal",
+    "-Wno-PINMISSING",
+    "-Wno-IMPLICIT",
+    "-Wno-WIDTHEXPAND",
+    "-Wno-WIDTHTRUNC",
+    "-Wno-DECLFILENAME",
+    "--no-timing",
+]
+
+MAKEFILE_ENV = {}
+
+# Parallel C++ compile of the Verilated model
+VERILATOR_COMPILE_SPEED_ARGS = [
+    "--build-jobs", "0",
+    "--output-split", "20000",
+]
+
+# Build directories already built by this process
+_built = set()
+
+
+def rtl_hash(sources, includes=(), parameters=None, defines=None,
+             build_args=()):
+    """Return a short sha1 over the RTL contents and the build options."""
+    h = hashlib.sha1()
+    for src in sources:
+        h.update(str(src).encode())
+        h.update(Path(src).read_bytes())
+    for inc in includes:
+        for hdr in sorted(Path(inc).glob("*.svh")):
+            h.update(hdr.read_bytes())
+    h.update(repr(sorted((parameters or {}).items())).encode())
+    h.update(repr(sorted((defines or {}).items())).encode())
+    h.update(repr(list(build_args)).encode())
+    return h.hexdigest()[:12]
+
+
+def _is_cocotb_test(decorator):
+    """Return True for a @cocotb.test or @cocotb.test(...) decorator."""
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    return (isinstance(decorator, ast.Attribute) and decorator.attr == "test"
+            and isinstance(decorator.value, ast.Name)
+            and decorator.value.id == "cocotb")
+
+
+def cocotb_testcases(module):
+    """Return the @cocotb.test function names of tests/<module>.py in order.
+
+    The source is parsed rather than imported, since importing a cocotb
+    test module outside the simulator fails.
+    """
+    tree = ast.parse((TESTS_DIR / f"{module}.py").read_text())
+    return [
+        node.name for node in tree.body
+        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef))
+        and any(_is_cocotb_test(d) for d in node.decorator_list)
+    ]
+
+
+def build_dir_for(module, key):
+    """Return the build directory for module/key on this pytest-xdist worker."""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    return TESTS_DIR / "sim_build" / f"{module}-{key}-{worker}"
+
+
+def run_testcase(module, toplevel, testcase, sources, includes=(),
+                 parameters=None, defines=None, build_args=(), extra_env=None):
+    """Build toplevel (if needed) and run a single cocotb testcase.
+
+    Fails the calling pytest item if the testcase did not run or failed.
+    """
+    sim = os.getenv("SIM", "verilator")
+    waves = os.getenv("WAVES", "0") == "1"
+    build_args = list(build_args)
+    if sim == "verilator":
+        build_args += VERILATOR_COMPILE_SPEED_ARGS
+    key = rtl_hash(sources, includes, parameters, defines,
+                   build_args + [sim, str(waves)])
+    build_dir = build_dir_for(module, key)
+
+    runner = get_runner(sim)
+    if build_dir not in _built:
+        runner.build(
+            verilog_sources=[str(s) for s in sources],
+            includes=[str(i) for i in includes],
+            hdl_toplevel=toplevel,
+            parameters=parameters or {},
+            defines=defines or {},
+            build_args=build_args,
+            build_dir=build_dir,
+            timescale=("1ns", "1ps"),
+            waves=waves,
+        )
+        _built.add(build_dir)
+    results_xml = runner.test(
+        hdl_toplevel=toplevel,
+        test_module=module,
+        testcase=testcase,
+        test_dir=TESTS_DIR,
+        build_dir=build_dir,
+        results_xml=str(build_dir / f"{testcase}.xml"),
+        extra_env=extra_env or {},
+        waves=waves,
+    )
+
+    num_tests, num_failed = get_results(results_xml)
+    assert num_tests > 0, f"{module}.{testcase} did not run"
+    assert num_failed == 0, f"{module}.{testcase} failed"
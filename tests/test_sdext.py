@@ -7,9 +7,12 @@ Tests for RISC-V Debug Specification external debug support:
 4. Resume from Debug Mode
 5. Single-step execution
 """
+import os
+
 import cocotb
-from cocotb.triggers import ClockCycles
+from cocotb.triggers import ClockCycles, First, RisingEdge
 from cocotb.clock import Clock
+from cocotb.utils import get_sim_time
 
 # CSR addresses
 CSR_DCSR = 0x7B0
@@ -30,86 +33,169 @@ DEBUG_CAUSE_RESETHALTREQ = 0x5
 # Trigger types
 TRIGGER_TYPE_MCONTROL = 0x2
 
+# mcontrol tdata1: execute match (bit 2), action=1 enter debug mode (bits 15:12)
+TDATA1_PC_EXECUTE_DEBUG = (TRIGGER_TYPE_MCONTROL << 28) | (1 << 12) | (1 << 2)
+
 # Debug ROM entry point (configured at build time)
 DEBUG_ENTRY_POINT = 0x600
 
 DEFAULT_CLK_PERIOD_NS = 10
 DEFAULT_RESET_CYCLES = 5
 
+# Values driven while reset is held, applied together before the first wait
+_INIT_SIGNALS = (
+    ("reset_n", 0),
+    ("dmem_wready", 1),
+    ("dmem_rvalid", 0),
+    ("imem_rvalid", 1),
+    ("i_haltreq", 0),
+    ("i_external_trigger", 0),
+)
+
+# cpu.proc_state handle, resolved once by the first init_dut (None if absent)
+_UNRESOLVED = object()
+_proc_state_handle = _UNRESOLVED
+
+# Set by Makefile.clint when the RTL generates its own clock (HDL_CLOCK=1)
+HDL_CLOCK = os.getenv("RVCORE_HDL_CLOCK", "0") == "1"
+
+
+def decode_dcsr(value):
+    """Split a dcsr value into (xdebugver, cause, step, prv)."""
+    return (
+        (value >> 28) & 0xF,  # [31:28]
+        (value >> 6) & 0x7,   # [8:6]
+        (value >> 2) & 0x1,   # [2]
+        value & 0x3,          # [1:0]
+    )
+
 
 async def init_dut(dut, clk_period_ns=None, reset_cycles=None):
-    """Initialize DUT with clock and reset."""
+    """Initialize DUT with clock and reset.
+
+    With HDL_CLOCK the RTL drives clk itself at DEFAULT_CLK_PERIOD_NS and
+    clk_period_ns is ignored.
+    """
+    global _proc_state_handle
+    if _proc_state_handle is _UNRESOLVED:
+        _proc_state_handle = getattr(dut.cpu, 'proc_state', None)
+
     if clk_period_ns is None:
         clk_period_ns = DEFAULT_CLK_PERIOD_NS
     if reset_cycles is None:
         reset_cycles = DEFAULT_RESET_CYCLES
 
-    cocotb.start_soon(Clock(dut.clk, clk_period_ns, units="ns").start())
+    if not HDL_CLOCK:
+        cocotb.start_soon(Clock(dut.clk, clk_period_ns, units="ns").start())
 
-    dut.reset_n.value = 0
-    dut.dmem_wready.value = 1
-    dut.dmem_rvalid.value = 0
-    dut.imem_rvalid.value = 1
-    dut.i_haltreq.value = 0
-    dut.i_external_trigger.value = 0
+    for name, value in _INIT_SIGNALS:
+        getattr(dut, name).value = value
 
     await ClockCycles(dut.clk, reset_cycles)
     dut.reset_n.value = 1
     await ClockCycles(dut.clk, 2)
 
 
+async def wait_for_debug_mode(dut, timeout_cycles=20, fast_cycles=4):
+    """Wait for debug_mode_o to rise, giving up after timeout_cycles.
+
+    haltreq usually takes effect within a few cycles, so the first
+    fast_cycles are checked one clock at a time; only a slower entry
+    falls back to waiting on the edge with the remaining timeout.
+
+    Returns True if the DUT is in debug mode afterwards.
+    """
+    debug_mode = dut.debug_mode_o
+    if debug_mode.value == 1:
+        return True
+    for _ in range(min(fast_cycles, timeout_cycles)):
+        await RisingEdge(dut.clk)
+        if debug_mode.value == 1:
+            return True
+    remaining = timeout_cycles - fast_cycles
+    if remaining > 0:
+        await First(RisingEdge(debug_mode), ClockCycles(dut.clk, remaining))
+    return debug_mode.value == 1
+
+
+async def _enter_debug_and_get_dcsr(dut):
+    """Halt the hart via haltreq and return (dcsr_value, current_pc).
+
+    Fails the test if the DUT does not enter debug mode.
+    """
+    dut.i_haltreq.value = 1
+    await ClockCycles(dut.clk, 1)
+    
+    entered_debug = await wait_for_debug_mode(dut)
+    
+    # dcsr, dpc and pc are updated on the same edge as debug_mode_o, so the
+    # release of haltreq needs no extra cycle before they are read
+    dut.i_haltreq.value = 0
+    
+    current_pc = int(dut.cpu.pc.value)
+    if not entered_debug:
+        dut._log.error(f"Failed to enter debug mode. PC=0x{current_pc:08x}")
+    assert dut.debug_mode_o.value == 1, "Should be in debug mode"
+    
+    return int(dut.cpu.dcsr.value), current_pc
+
+
 @cocotb.test()
 async def test_debug_mode_entry_haltreq(dut):
     """Test Debug Mode entry via haltreq from DM."""
     await init_dut(dut)
     
+    # Bind handles once
+    dbg = dut.debug_mode_o
+    cpu = dut.cpu
+    dcsr = cpu.dcsr
+    pc = cpu.pc
+    dpc = cpu.dpc
+    
     dut._log.info("Testing Debug Mode entry via haltreq")
     
     # Verify initial state - not in debug mode
-    initial_debug = int(dut.debug_mode_o.value)
+    initial_debug = int(dbg.value)
     assert initial_debug == 0, f"Should start in normal mode, got {initial_debug}"
     
     # Wait for CPU to stabilize and start executing
     await ClockCycles(dut.clk, 5)
-    pc_before_halt = int(dut.cpu.pc.value)
-    dut._log.info(f"PC before halt: 0x{pc_before_halt:08x}")
+    pc_before_halt = int(pc.value)
+    dut._log.debug("PC before halt: 0x%08x", pc_before_halt)
     
     # Assert haltreq
     dut.i_haltreq.value = 1
     await ClockCycles(dut.clk, 1)
     
     # Wait for debug mode entry (may take a few cycles for instruction to retire)
-    entered_debug = False
-    for cycle in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            entered_debug = True
-            dut._log.info(f"Entered debug mode after {cycle + 1} cycles")
-            break
+    wait_start = get_sim_time(units="ns")
+    entered_debug = await wait_for_debug_mode(dut)
+    if entered_debug:
+        cycles = int((get_sim_time(units="ns") - wait_start) // DEFAULT_CLK_PERIOD_NS)
+        dut._log.debug("Entered debug mode after %d cycles", cycles)
     
     dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
     
     # Verify Debug Mode entry
-    debug_mode = int(dut.debug_mode_o.value)
+    debug_mode = int(dbg.value)
     if not entered_debug:
-        proc_state = int(dut.cpu.proc_state.value) if hasattr(dut.cpu, 'proc_state') else -1
+        proc_state = int(_proc_state_handle.value) if _proc_state_handle is not None else -1
         dut._log.error(f"Failed to enter debug mode. proc_state={proc_state}, debug_mode={debug_mode}")
     assert debug_mode == 1, f"Should enter debug mode, got {debug_mode}"
     
     # Check dcsr.cause = 3 (haltreq)
-    dcsr_value = int(dut.cpu.dcsr.value)
-    cause = (dcsr_value >> 6) & 0x7
-    dut._log.info(f"dcsr: 0x{dcsr_value:08x}, cause: {cause}")
+    dcsr_value = int(dcsr.value)
+    _, cause, _, _ = decode_dcsr(dcsr_value)
+    dut._log.debug("dcsr: 0x%08x, cause: %d", dcsr_value, cause)
     assert cause == DEBUG_CAUSE_HALTREQ, f"cause should be {DEBUG_CAUSE_HALTREQ}, got {cause}"
     
     # Check dpc saved
-    dpc_value = int(dut.cpu.dpc.value)
-    dut._log.info(f"dpc: 0x{dpc_value:08x}")
+    dpc_value = int(dpc.value)
+    dut._log.debug("dpc: 0x%08x", dpc_value)
     
     # Check PC jumped to debug entry point
-    current_pc = int(dut.cpu.pc.value)
-    dut._log.info(f"PC after debug entry: 0x{current_pc:08x}")
+    current_pc = int(pc.value)
+    dut._log.debug("PC after debug entry: 0x%08x", current_pc)
     assert current_pc == DEBUG_ENTRY_POINT, f"PC should be 0x{DEBUG_ENTRY_POINT:x}, got 0x{current_pc:08x}"
     
     dut._log.info("✓ Debug Mode entry via haltreq works correctly")
@@ -120,19 +206,23 @@ async def test_debug_mode_entry_trigger(dut):
     """Test Debug Mode entry via trigger (action=1)."""
     await init_dut(dut)
     
+    # Bind handles once
+    dbg = dut.debug_mode_o
+    cpu = dut.cpu
+    dcsr = cpu.dcsr
+    pc = cpu.pc
+    
     dut._log.info("Testing Debug Mode entry via trigger")
     
     # Get current PC
     await ClockCycles(dut.clk, 2)
-    current_pc = int(dut.cpu.pc.value)
+    current_pc = int(pc.value)
     trigger_pc = current_pc + 0x10
     
     # Configure PC trigger: type=2, execute, action=1 (debug mode)
-    tdata1_value = (TRIGGER_TYPE_MCONTROL << 28) | (1 << 12) | (1 << 2)
-    
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
-    dut.cpu.tdata2[0].value = trigger_pc
+    cpu.tselect.value = 0
+    cpu.tdata1[0].value = TDATA1_PC_EXECUTE_DEBUG
+    cpu.tdata2[0].value = trigger_pc
     
     await ClockCycles(dut.clk, 2)
     
@@ -140,13 +230,13 @@ async def test_debug_mode_entry_trigger(dut):
     await ClockCycles(dut.clk, 10)
     
     # Check if debug mode was entered
-    debug_mode = int(dut.debug_mode_o.value)
+    debug_mode = int(dbg.value)
     
     if debug_mode == 1:
         # Check dcsr.cause = 2 (trigger)
-        dcsr_value = int(dut.cpu.dcsr.value)
-        cause = (dcsr_value >> 6) & 0x7
-        dut._log.info(f"Trigger fired! dcsr: 0x{dcsr_value:08x}, cause: {cause}")
+        dcsr_value = int(dcsr.value)
+        _, cause, _, _ = decode_dcsr(dcsr_value)
+        dut._log.debug("Trigger fired! dcsr: 0x%08x, cause: %d", dcsr_value, cause)
         assert cause == DEBUG_CAUSE_TRIGGER, f"cause should be {DEBUG_CAUSE_TRIGGER}, got {cause}"
         dut._log.info("✓ Debug Mode entry via trigger works correctly")
     else:
@@ -154,43 +244,33 @@ async def test_debug_mode_entry_trigger(dut):
 
 
 @cocotb.test()
-async def test_dcsr_register_fields(dut):
-    """Test dcsr register fields are correctly maintained."""
+async def test_debug_entry_state(dut):
+    """Test dcsr fields, privilege, dpc and PC after a single debug entry."""
     await init_dut(dut)
     
-    dut._log.info("Testing dcsr register fields")
-    
-    # Enter debug mode
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    for _ in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            break
+    # Bind handles once
+    cpu = dut.cpu
+    pc = cpu.pc
+    dpc = cpu.dpc
     
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
+    dut._log.info("Testing architectural state on debug entry")
     
-    # Verify in debug mode
-    debug_mode = int(dut.debug_mode_o.value)
-    assert debug_mode == 1, "Should be in debug mode"
+    # Wait for CPU to stabilize
+    await ClockCycles(dut.clk, 5)
+    pc_before = int(pc.value)
+    dut._log.debug("PC before debug entry: 0x%08x", pc_before)
     
-    # Read dcsr
-    dcsr_value = int(dut.cpu.dcsr.value)
+    # Enter debug mode once; all checks below use this entry
+    dcsr_value, current_pc = await _enter_debug_and_get_dcsr(dut)
     
-    # Extract fields
-    xdebugver = (dcsr_value >> 28) & 0xF  # [31:28]
-    cause = (dcsr_value >> 6) & 0x7       # [8:6]
-    step = (dcsr_value >> 2) & 0x1        # [2]
-    prv = dcsr_value & 0x3                # [1:0]
+    # dcsr register fields
+    xdebugver, cause, step, prv = decode_dcsr(dcsr_value)
     
-    dut._log.info(f"dcsr: 0x{dcsr_value:08x}")
-    dut._log.info(f"  xdebugver: {xdebugver}")
-    dut._log.info(f"  cause: {cause}")
-    dut._log.info(f"  step: {step}")
-    dut._log.info(f"  prv: {prv}")
+    dut._log.debug("dcsr: 0x%08x", dcsr_value)
+    dut._log.debug("  xdebugver: %d", xdebugver)
+    dut._log.debug("  cause: %d", cause)
+    dut._log.debug("  step: %d", step)
+    dut._log.debug("  prv: %d", prv)
     
     # Verify xdebugver = 4
     assert xdebugver == 4, f"xdebugver should be 4, got {xdebugver}"
@@ -198,59 +278,19 @@ async def test_dcsr_register_fields(dut):
     # Verify cause = haltreq
     assert cause == DEBUG_CAUSE_HALTREQ, f"cause should be {DEBUG_CAUSE_HALTREQ}, got {cause}"
     
-    # Verify prv = M-mode (11)
-    assert prv == 3, f"prv should be 3 (M-mode), got {prv}"
-    
-    dut._log.info("✓ dcsr register fields correct")
-
-
-@cocotb.test()
-async def test_dpc_register_save_restore(dut):
-    """Test dpc register saves PC correctly on debug entry."""
-    await init_dut(dut)
-    
-    dut._log.info("Testing dpc register save/restore")
-    
-    # Wait for CPU to stabilize
-    await ClockCycles(dut.clk, 5)
-    pc_before = int(dut.cpu.pc.value)
-    dut._log.info(f"PC before debug entry: 0x{pc_before:08x}")
-    
-    # Enter debug mode via haltreq
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    entered_debug = False
-    for cycle in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            entered_debug = True
-            break
-    
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
-    
-    # Check debug mode entered
-    debug_mode = int(dut.debug_mode_o.value)
-    if not entered_debug:
-        dut._log.error(f"Failed to enter debug mode in dpc test")
-    assert debug_mode == 1, "Should be in debug mode"
-    
-    # Read dpc
-    dpc_value = int(dut.cpu.dpc.value)
-    dut._log.info(f"dpc after debug entry: 0x{dpc_value:08x}")
-    dut._log.info(f"pc_before was: 0x{pc_before:08x}")
+    # Debug Mode operates at M-mode privilege (prv = 11)
+    assert prv == 3, f"Debug Mode should be M-mode (3), got {prv}"
     
     # dpc should contain a PC value (exact value depends on when halt occurred)
-    # Just verify it's a reasonable PC value
+    dpc_value = int(dpc.value)
+    dut._log.debug("dpc after debug entry: 0x%08x", dpc_value)
     assert dpc_value != 0, f"dpc should be set, got 0x{dpc_value:08x}"
     
-    # Verify PC jumped to debug ROM entry point
-    current_pc = int(dut.cpu.pc.value)
+    # PC jumped to debug ROM entry point
+    dut._log.debug("PC after debug entry: 0x%08x", current_pc)
     assert current_pc == DEBUG_ENTRY_POINT, f"PC should be 0x{DEBUG_ENTRY_POINT:x}, got 0x{current_pc:08x}"
     
-    dut._log.info("✓ dpc saves PC correctly on debug entry")
+    dut._log.info("✓ dcsr fields, privilege, dpc and debug ROM entry point correct")
 
 
 @cocotb.test()
@@ -258,40 +298,27 @@ async def test_dscratch_registers(dut):
     """Test dscratch0 and dscratch1 registers accessible in debug mode."""
     await init_dut(dut)
     
+    # Bind handles once
+    cpu = dut.cpu
+    
     dut._log.info("Testing dscratch0/1 registers")
     
     # Enter debug mode
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    for _ in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            break
+    await _enter_debug_and_get_dcsr(dut)
     
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
-    
-    debug_mode = int(dut.debug_mode_o.value)
-    assert debug_mode == 1, "Should be in debug mode"
-    
-    # Test dscratch0 - now individual registers
+    # dscratch0/1 are independent registers: write both, then wait once
     test_value0 = 0xDEADBEEF
-    dut.cpu.dscratch0.value = test_value0
+    test_value1 = 0xCAFEBABE
+    cpu.dscratch0.value = test_value0
+    cpu.dscratch1.value = test_value1
     await ClockCycles(dut.clk, 2)
     
-    read_value0 = int(dut.cpu.dscratch0.value)
-    dut._log.info(f"dscratch0: write=0x{test_value0:08x}, read=0x{read_value0:08x}")
+    read_value0 = int(cpu.dscratch0.value)
+    dut._log.debug("dscratch0: write=0x%08x, read=0x%08x", test_value0, read_value0)
     assert read_value0 == test_value0, f"dscratch0 mismatch"
     
-    # Test dscratch1 - now individual registers
-    test_value1 = 0xCAFEBABE
-    dut.cpu.dscratch1.value = test_value1
-    await ClockCycles(dut.clk, 2)
-    
-    read_value1 = int(dut.cpu.dscratch1.value)
-    dut._log.info(f"dscratch1: write=0x{test_value1:08x}, read=0x{read_value1:08x}")
+    read_value1 = int(cpu.dscratch1.value)
+    dut._log.debug("dscratch1: write=0x%08x, read=0x%08x", test_value1, read_value1)
     assert read_value1 == test_value1, f"dscratch1 mismatch"
     
     dut._log.info("✓ dscratch0/1 accessible in debug mode")
@@ -302,160 +329,75 @@ async def test_debug_mode_suppresses_triggers(dut):
     """Test that triggers don't fire when in debug mode."""
     await init_dut(dut)
     
+    # Bind handles once
+    cpu = dut.cpu
+    pc = cpu.pc
+    
     dut._log.info("Testing triggers suppressed in debug mode")
     
     # Configure a trigger before entering debug mode
     await ClockCycles(dut.clk, 2)
-    current_pc = int(dut.cpu.pc.value)
+    current_pc = int(pc.value)
     
-    tdata1_value = (TRIGGER_TYPE_MCONTROL << 28) | (1 << 12) | (1 << 2)
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
-    dut.cpu.tdata2[0].value = current_pc + 0x10
+    cpu.tselect.value = 0
+    cpu.tdata1[0].value = TDATA1_PC_EXECUTE_DEBUG
+    cpu.tdata2[0].value = current_pc + 0x10
     
     await ClockCycles(dut.clk, 2)
     
     # Enter debug mode
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    for _ in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            break
-    
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
-    
-    debug_mode = int(dut.debug_mode_o.value)
-    assert debug_mode == 1, "Should be in debug mode"
+    await _enter_debug_and_get_dcsr(dut)
     
     # Check trigger_fire is 0 even though trigger is configured
-    trigger_fire = int(dut.cpu.trigger_fire.value)
+    trigger_fire = int(cpu.trigger_fire.value)
     assert trigger_fire == 0, f"Triggers should not fire in debug mode, got {trigger_fire}"
     
     # Wait some cycles - trigger should remain suppressed
     await ClockCycles(dut.clk, 5)
     
-    trigger_fire_after = int(dut.cpu.trigger_fire.value)
+    trigger_fire_after = int(cpu.trigger_fire.value)
     assert trigger_fire_after == 0, "Triggers should stay suppressed in debug mode"
     
     dut._log.info("✓ Triggers correctly suppressed in debug mode")
 
 
-@cocotb.test()
-async def test_debug_mode_privilege_level(dut):
-    """Test Debug Mode operates at M-mode privilege."""
-    await init_dut(dut)
-    
-    dut._log.info("Testing Debug Mode privilege level")
-    
-    # Enter debug mode
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    for _ in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            break
-    
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
-    
-    debug_mode = int(dut.debug_mode_o.value)
-    assert debug_mode == 1, "Should be in debug mode"
-    
-    # Check dcsr.prv = M-mode (3)
-    dcsr_value = int(dut.cpu.dcsr.value)
-    prv = dcsr_value & 0x3
-    
-    dut._log.info(f"Debug Mode privilege: prv={prv}")
-    assert prv == 3, f"Debug Mode should be M-mode (3), got {prv}"
-    
-    dut._log.info("✓ Debug Mode operates at M-mode privilege")
-
-
-@cocotb.test()
-async def test_debug_rom_entry_point(dut):
-    """Test PC jumps to debug ROM entry point on debug entry."""
-    await init_dut(dut)
-    
-    dut._log.info("Testing debug ROM entry point")
-    
-    # Wait for CPU to stabilize
-    await ClockCycles(dut.clk, 5)
-    pc_before = int(dut.cpu.pc.value)
-    dut._log.info(f"PC before debug: 0x{pc_before:08x}")
-    
-    # Enter debug mode
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    entered_debug = False
-    for cycle in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            entered_debug = True
-            break
-    
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
-    
-    # Check PC is at debug entry point
-    pc_after = int(dut.cpu.pc.value)
-    dut._log.info(f"PC after debug entry: 0x{pc_after:08x}")
-    
-    if not entered_debug:
-        dut._log.error(f"Failed to enter debug mode in ROM entry test. PC=0x{pc_after:08x}")
-    
-    # Debug entry point should match configured value
-    assert pc_after == DEBUG_ENTRY_POINT, f"PC should be 0x{DEBUG_ENTRY_POINT:x}, got 0x{pc_after:08x}"
-    
-    dut._log.info("✓ PC correctly jumps to debug ROM entry point")
-
-
 @cocotb.test()
 async def test_multiple_debug_entries(dut):
     """Test multiple debug entry/exit cycles."""
     await init_dut(dut)
     
+    # Bind handles once
+    cpu = dut.cpu
+    dcsr = cpu.dcsr
+    
     dut._log.info("Testing multiple debug entry/exit cycles")
     
     for cycle in range(3):
-        dut._log.info(f"  Cycle {cycle + 1}")
+        dut._log.debug("  Cycle %d", cycle + 1)
         
-        # Enter debug mode
+        # Enter debug mode. haltreq is held across at least one edge, since
+        # from the second cycle on debug_mode_o is already high and the wait
+        # returns at once
         dut.i_haltreq.value = 1
-        await ClockCycles(dut.clk, 1)
+        await RisingEdge(dut.clk)
+        entered_debug = await wait_for_debug_mode(dut)
+        assert entered_debug, f"Cycle {cycle}: Should be in debug mode"
         
-        # Wait for debug mode entry
-        for _ in range(20):
-            await ClockCycles(dut.clk, 1)
-            if int(dut.debug_mode_o.value) == 1:
-                break
+        # Check dcsr.cause before releasing haltreq
+        dcsr_value = int(dcsr.value)
+        _, cause, _, _ = decode_dcsr(dcsr_value)
+        assert cause == DEBUG_CAUSE_HALTREQ, f"Cycle {cycle}: Wrong cause {cause}"
         
         dut.i_haltreq.value = 0
-        await ClockCycles(dut.clk, 1)
-        
-        # Verify debug mode
-        debug_mode = int(dut.debug_mode_o.value)
-        assert debug_mode == 1, f"Cycle {cycle}: Should be in debug mode"
-        
-        # Check dcsr.cause
-        dcsr_value = int(dut.cpu.dcsr.value)
-        cause = (dcsr_value >> 6) & 0x7
-        assert cause == DEBUG_CAUSE_HALTREQ, f"Cycle {cycle}: Wrong cause {cause}"
         
         # Stay in debug mode for a while
         await ClockCycles(dut.clk, 3)
+        assert dut.debug_mode_o.value == 1, f"Cycle {cycle}: Should stay in debug mode"
         
         # Note: Full exit from debug mode requires DRET instruction execution
         # which is beyond scope of this unit test
         
-        dut._log.info(f"    ✓ Cycle {cycle + 1} completed")
+        dut._log.debug("    ✓ Cycle %d completed", cycle + 1)
     
     dut._log.info("✓ Multiple debug entries work correctly")
 
@@ -465,42 +407,32 @@ async def test_dcsr_step_bit_readwrite(dut):
     """Test dcsr.step bit can be read and written in debug mode."""
     await init_dut(dut)
     
+    # Bind handles once
+    cpu = dut.cpu
+    
     dut._log.info("Testing dcsr.step bit read/write")
     
     # Enter debug mode
-    dut.i_haltreq.value = 1
-    await ClockCycles(dut.clk, 1)
-    
-    # Wait for debug mode entry
-    for _ in range(20):
-        await ClockCycles(dut.clk, 1)
-        if int(dut.debug_mode_o.value) == 1:
-            break
-    
-    dut.i_haltreq.value = 0
-    await ClockCycles(dut.clk, 1)
-    
-    debug_mode = int(dut.debug_mode_o.value)
-    assert debug_mode == 1, "Should be in debug mode"
+    await _enter_debug_and_get_dcsr(dut)
     
     # Read initial step bit
-    initial_step = int(dut.cpu.dcsr_step.value)
-    dut._log.info(f"Initial dcsr.step: {initial_step}")
+    initial_step = int(cpu.dcsr_step.value)
+    dut._log.debug("Initial dcsr.step: %d", initial_step)
     
     # Write step=1
-    dut.cpu.dcsr_step.value = 1
+    cpu.dcsr_step.value = 1
     await ClockCycles(dut.clk, 2)
     
     # Read back
-    step_after = int(dut.cpu.dcsr_step.value)
-    dut._log.info(f"After write: dcsr.step={step_after}")
+    step_after = int(cpu.dcsr_step.value)
+    dut._log.debug("After write: dcsr.step=%d", step_after)
     assert step_after == 1, f"step should be 1, got {step_after}"
     
     # Clear step
-    dut.cpu.dcsr_step.value = 0
+    cpu.dcsr_step.value = 0
     await ClockCycles(dut.clk, 2)
     
-    step_cleared = int(dut.cpu.dcsr_step.value)
+    step_cleared = int(cpu.dcsr_step.value)
     assert step_cleared == 0, f"step should be 0, got {step_cleared}"
     
     dut._log.info("✓ dcsr.step bit read/write works correctly")
@@ -0,0 +1,31 @@
+"""Run the Sdext cocotb tests from pytest, one simulator run per testcase.
+
+Usage (from tests/):
+    pytest -n auto test_sdext_pytest.py
+"""
+import pytest
+
+from sim_runner import (
+    TOP_WITH_RAM_SIM_INCLUDES,
+    TOP_WITH_RAM_SIM_SOURCES,
+    VERILATOR_BUILD_ARGS,
+    cocotb_testcases,
+    run_testcase,
+)
+
+TESTCASES = cocotb_testcases("test_sdext")
+
+
+@pytest.mark.parametrize("testcase", TESTCASES)
+def test_sdext(testcase):
+    run_testcase(
+        module="test_sdext",
+        toplevel="top_with_ram_sim",
+        testcase=testcase,
+        sources=TOP_WITH_RAM_SIM_SOURCES,
+        includes=TOP_WITH_RAM_SIM_INCLUDES,
+        parameters={"TOHOST_ADDR": 4096},
+        # Same as make test-sdext (SIM_MONITORS=0 HDL_CLOCK=0)
+        defines={"SYNTHESIS": 1},
+        build_args=VERILATOR_BUILD_ARGS + ["--no-timing"],
+    )
@@ -9,13 +9,8 @@ This test suite verifies:
 6. Multiple trigger configuration
 """
 import cocotb
-from cocotb.triggers import ClockCycles, RisingEdge, Timer
+from cocotb.triggers import ClockCycles, RisingEdge
 from cocotb.clock import Clock
-from cocotb.types import LogicArray
-import os
-import sys
-
-sys.path.insert(0, os.path.dirname(__file__))
 
 # CSR addresses
 CSR_TSELECT = 0x7A0
@@ -39,15 +34,57 @@ MCONTROL_EXECUTE = 1 << 2
 MCONTROL_STORE = 1 << 1
 MCONTROL_LOAD = 1 << 0
 
+# tdata1 encodings used by the tests
+TDATA1_EXEC = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_EXECUTE
+TDATA1_LOAD = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_LOAD
+TDATA1_STORE = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_STORE
+TDATA1_ICOUNT1 = (TRIGGER_TYPE_ICOUNT << 28) | 0x1  # count = 1
+# tmexttrigger: select = external input 2 / 0, action = 1 (enter debug mode)
+TDATA1_EXT2 = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (2 << 16) | (1 << 12)
+TDATA1_EXT0 = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (0 << 16) | (1 << 12)
+
 # Debug ROM entry point
 DEBUG_ENTRY_POINT = 0x800
 
+# Execute-trigger address the streamed test programs never reach
+UNREACHABLE_PC = 0xFFFF_FFF0
+
 DEFAULT_CLK_PERIOD_NS = 10
 DEFAULT_RESET_CYCLES = 5
 
+# Clocks the core spends on a non-memory instruction (PROC -> IMEM_READ -> IMEM_DONE)
+FETCH_CYCLES = 3
+
+# Constant funct3/opcode fields of the encoders below, already shifted into place
+_CSRRW_BASE = (0x1 << 12) | 0x73
+_CSRRS_BASE = (0x2 << 12) | 0x73
+_ADDI_BASE = (0x0 << 12) | 0x13
+_SW_BASE = (0x2 << 12) | 0x23
+_LW_BASE = (0x2 << 12) | 0x03
+
+# Input values driven by init_dut while reset is asserted
+_INIT_SIGNALS = (
+    ("reset_n", 0),
+    ("dmem_wready", 1),
+    ("dmem_rvalid", 0),
+    ("dmem_rdata", 0),
+    # NOP (addi x0, x0, 0) on the fetch port
+    ("imem_rvalid", 1),
+    ("imem_rdata", 0x00000013),
+    ("m_external_interrupt", 0),
+    ("m_timer_interrupt", 0),
+    ("m_software_interrupt", 0),
+    ("i_haltreq", 0),
+    ("i_external_trigger", 0),
+)
+
+# Set once init_dut has run in this simulation (see soft_reset)
+_dut_initialized = False
+
 
 async def init_dut(dut, clk_period_ns=None, reset_cycles=None):
     """Initialize DUT with clock and reset."""
+    global _dut_initialized
     if clk_period_ns is None:
         clk_period_ns = DEFAULT_CLK_PERIOD_NS
     if reset_cycles is None:
@@ -56,51 +93,70 @@ async def init_dut(dut, clk_period_ns=None, reset_cycles=None):
     # Start clock
     cocotb.start_soon(Clock(dut.clk, clk_period_ns, units="ns").start())
 
-    # Initialize inputs
-    dut.reset_n.value = 0
-    dut.dmem_wready.value = 1
-    dut.dmem_rvalid.value = 0
-    dut.dmem_rdata.value = 0
-    # Provide NOP instruction (0x00000013 = addi x0, x0, 0) for instruction fetch
-    dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = 0x00000013
-    dut.m_external_interrupt.value = 0
-    dut.m_timer_interrupt.value = 0
-    dut.m_software_interrupt.value = 0
-    dut.i_haltreq.value = 0
-    dut.i_external_trigger.value = 0
+    # Initialize inputs (all writes land in the same timestep)
+    for name, value in _INIT_SIGNALS:
+        getattr(dut, name).value = value
 
     await ClockCycles(dut.clk, reset_cycles)
     dut.reset_n.value = 1
     await ClockCycles(dut.clk, 5)  # Longer delay after reset
+    _dut_initialized = True
+
+
+async def soft_reset(dut, clk_period_ns=None):
+    """Re-initialize a DUT that init_dut already brought up in this run.
+    
+    All core state is on asynchronous reset, so a one-cycle reset_n pulse
+    clears it (including debug mode and the trigger CSRs) without the long
+    reset sequence. Falls back to init_dut when nothing has initialized the
+    DUT yet, e.g. when a testcase runs on its own.
+    
+    Returns while the core is still on its first instruction, with inst_pc
+    equal to START_ADDR (0). tdata2 resets to 0, so an execute trigger
+    enabled without a tdata2 value matches at once; give it an address
+    the test never reaches (e.g. UNREACHABLE_PC).
+    """
+    if not _dut_initialized:
+        await init_dut(dut, clk_period_ns)
+        return
+    if clk_period_ns is None:
+        clk_period_ns = DEFAULT_CLK_PERIOD_NS
+
+    # The previous test's clock task was killed when that test ended
+    cocotb.start_soon(Clock(dut.clk, clk_period_ns, units="ns").start())
+
+    for name, value in _INIT_SIGNALS:
+        getattr(dut, name).value = value
+
+    await ClockCycles(dut.clk, 1)
+    dut.reset_n.value = 1
+    await ClockCycles(dut.clk, 2)
 
 
 def encode_csrrw(rd, csr, rs1):
     """Encode CSRRW instruction."""
-    return (csr << 20) | (rs1 << 15) | (0x1 << 12) | (rd << 7) | 0x73
+    return (csr << 20) | (rs1 << 15) | (rd << 7) | _CSRRW_BASE
 
 
 def encode_csrrs(rd, csr, rs1):
     """Encode CSRRS instruction."""
-    return (csr << 20) | (rs1 << 15) | (0x2 << 12) | (rd << 7) | 0x73
+    return (csr << 20) | (rs1 << 15) | (rd << 7) | _CSRRS_BASE
 
 
 def encode_addi(rd, rs1, imm):
     """Encode ADDI instruction."""
-    return (imm << 20) | (rs1 << 15) | (0x0 << 12) | (rd << 7) | 0x13
+    return (imm << 20) | (rs1 << 15) | (rd << 7) | _ADDI_BASE
 
 
 def encode_sw(rs2, rs1, imm):
     """Encode SW instruction."""
-    imm_11_5 = (imm >> 5) & 0x7F
-    imm_4_0 = imm & 0x1F
-    return (imm_11_5 << 25) | (rs2 << 20) | (rs1 << 15) | \
-           (0x2 << 12) | (imm_4_0 << 7) | 0x23
+    return (((imm >> 5) & 0x7F) << 25) | (rs2 << 20) | (rs1 << 15) | \
+           ((imm & 0x1F) << 7) | _SW_BASE
 
 
 def encode_lw(rd, rs1, imm):
     """Encode LW instruction."""
-    return (imm << 20) | (rs1 << 15) | (0x2 << 12) | (rd << 7) | 0x03
+    return (imm << 20) | (rs1 << 15) | (rd << 7) | _LW_BASE
 
 
 def encode_nop():
@@ -113,44 +169,88 @@ def encode_dret():
     return 0x7B200073
 
 
-async def write_csr_full(dut, csr_addr, value):
-    """Write a full 32-bit value to a CSR.
+def snapshot(dut):
+    """Read (trigger_fire, debug_mode_o) at the current observation point.
     
-    Uses multiple instructions to load the full 32-bit value.
+    Returns the raw 1-bit values: they compare equal to ints and format as
+    their bit string, so no int() conversion is needed.
     """
-    # Load lower 12 bits
-    # ADDI x2, x0, value[11:0]
-    dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = encode_addi(2, 0, value & 0xFFF)
+    return dut.trigger_fire.value, dut.debug_mode_o.value
+
+
+async def _serve_dmem_read(dut, data):
+    """Answer the next data read with a one-cycle dmem_rvalid pulse."""
+    await RisingEdge(dut.dmem_rready)
+    dut.dmem_rdata.value = data
+    dut.dmem_rvalid.value = 1
     await RisingEdge(dut.clk)
-    dut.imem_rvalid.value = 0
-    await ClockCycles(dut.clk, 2)
+    dut.dmem_rvalid.value = 0
+
+
+def poke_trigger(dut, idx, tdata1, tdata2=None):
+    """Configure trigger idx by writing the trigger CSRs directly (backdoor).
     
-    # If upper 20 bits are non-zero, use LUI to load them
-    if (value >> 12) != 0:
-        # LUI x3, value[31:12]
-        lui_imm = (value >> 12) & 0xFFFFF
-        lui_inst = (lui_imm << 12) | (3 << 7) | 0x37  # LUI x3, imm
-        dut.imem_rvalid.value = 1
-        dut.imem_rdata.value = lui_inst
-        await RisingEdge(dut.clk)
-        dut.imem_rvalid.value = 0
-        await ClockCycles(dut.clk, 2)
-        
-        # OR x2, x2, x3 to combine
-        or_inst = (3 << 20) | (2 << 15) | (0x6 << 12) | (2 << 7) | 0x33
-        dut.imem_rvalid.value = 1
-        dut.imem_rdata.value = or_inst
-        await RisingEdge(dut.clk)
-        dut.imem_rvalid.value = 0
-        await ClockCycles(dut.clk, 2)
+    For setup only: the values land on the next clock edge without going
+    through CSRRW, so use the instruction path when the CSR access itself
+    is under test.
+    """
+    dut.tselect.value = idx
+    dut.tdata1[idx].value = tdata1
+    if tdata2 is not None:
+        dut.tdata2[idx].value = tdata2
+
+
+async def _stream_instrs(dut, insts):
+    """Feed non-memory instructions to the core back to back.
     
-    # Now execute CSRRW x1, csr, x2
+    imem_rvalid stays high for the whole burst and each instruction is
+    presented for one fetch period, so the core latches every instruction
+    exactly once without stalling in IMEM_READ in between.
+    """
     dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = encode_csrrw(1, csr_addr, 2)
-    await RisingEdge(dut.clk)
+    for inst in insts:
+        dut.imem_rdata.value = inst
+        await ClockCycles(dut.clk, FETCH_CYCLES)
     dut.imem_rvalid.value = 0
-    await ClockCycles(dut.clk, 2)
+
+
+async def _write_csr_short(dut, csr_addr, val12):
+    """Write a value that fits the signed 12-bit ADDI immediate to a CSR.
+    
+    Executes: ADDI x2, x0, val12; CSRRW x1, csr, x2
+    """
+    assert -2048 <= val12 < 2048, \
+        f"0x{val12:x} does not fit a 12-bit immediate, use write_csr_full"
+    await _stream_instrs(dut, [
+        encode_addi(2, 0, val12 & 0xFFF),
+        encode_csrrw(1, csr_addr, 2),
+    ])
+
+
+async def _write_csr_long(dut, csr_addr, value):
+    """Write an arbitrary 32-bit value to a CSR.
+    
+    Executes: LUI x2, hi20; ADDI x2, x2, lo12; CSRRW x1, csr, x2
+    (hi20 is rounded so that the sign-extended lo12 adds back correctly)
+    """
+    value &= 0xFFFFFFFF
+    hi20 = ((value + 0x800) >> 12) & 0xFFFFF
+    await _stream_instrs(dut, [
+        (hi20 << 12) | (2 << 7) | 0x37,
+        encode_addi(2, 2, value & 0xFFF),
+        encode_csrrw(1, csr_addr, 2),
+    ])
+
+
+async def write_csr_full(dut, csr_addr, value):
+    """Write a full 32-bit value to a CSR.
+    
+    Values that fit a 12-bit immediate use the 2-instruction sequence.
+    """
+    if -2048 <= value < 2048:
+        await _write_csr_short(dut, csr_addr, value)
+    else:
+        await _write_csr_long(dut, csr_addr, value)
 
 
 async def write_csr(dut, csr_addr, value):
@@ -163,11 +263,7 @@ async def read_csr(dut, csr_addr):
     
     Executes: CSRRS x3, csr, x0 (reads without side effects)
     """
-    dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = encode_csrrs(3, csr_addr, 0)
-    await RisingEdge(dut.clk)
-    dut.imem_rvalid.value = 0
-    await ClockCycles(dut.clk, 3)
+    await _stream_instrs(dut, [encode_csrrs(3, csr_addr, 0)])
 
 
 @cocotb.test()
@@ -178,30 +274,26 @@ async def test_trigger_csr_access(dut):
     dut._log.info("Testing trigger CSR access")
     
     # Initially, trigger should not be fired
-    initial_trigger_fire = int(dut.trigger_fire.value)
+    initial_trigger_fire, initial_debug_mode = snapshot(dut)
     assert initial_trigger_fire == 0, \
         f"Initial trigger_fire should be 0, got {initial_trigger_fire}"
     
-    initial_debug_mode = int(dut.debug_mode_o.value)
     assert initial_debug_mode == 0, \
         f"Initial debug_mode should be 0, got {initial_debug_mode}"
     
     # Write to tselect to select trigger 0
     await write_csr(dut, CSR_TSELECT, 0)
-    await ClockCycles(dut.clk, 2)
     
     # Write to tdata1 (configure as mcontrol, execute trigger)
-    tdata1_value = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_EXECUTE
-    await write_csr(dut, CSR_TDATA1, tdata1_value & 0xFFF)
-    await ClockCycles(dut.clk, 2)
+    await write_csr_full(dut, CSR_TDATA1, TDATA1_EXEC)
     
     # Write to tdata2 (trigger address)
     trigger_addr = 0x100
-    await write_csr(dut, CSR_TDATA2, trigger_addr & 0xFFF)
-    await ClockCycles(dut.clk, 2)
+    await write_csr_full(dut, CSR_TDATA2, trigger_addr)
+    await ClockCycles(dut.clk, 6)
     
     # After configuration, trigger should still not be fired
-    post_config_trigger_fire = int(dut.trigger_fire.value)
+    post_config_trigger_fire = dut.trigger_fire.value
     assert post_config_trigger_fire == 0, \
         f"Trigger should not fire after configuration, got {post_config_trigger_fire}"
     
@@ -211,7 +303,7 @@ async def test_trigger_csr_access(dut):
 @cocotb.test()
 async def test_execution_trigger(dut):
     """Test execution trigger (PC breakpoint) with comprehensive assertions."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing execution trigger")
     
@@ -219,77 +311,62 @@ async def test_execution_trigger(dut):
     trigger_pc = 0x100
     
     # Initial state verification
-    initial_trigger_fire = int(dut.trigger_fire.value)
-    initial_debug_mode = int(dut.debug_mode_o.value)
+    initial_trigger_fire, initial_debug_mode = snapshot(dut)
     assert initial_trigger_fire == 0, \
         f"Initial trigger should not fire, got {initial_trigger_fire}"
     assert initial_debug_mode == 0, \
         f"Initial debug mode should be 0, got {initial_debug_mode}"
     
-    # Select trigger 0
-    await write_csr(dut, CSR_TSELECT, 0)
-    
-    # Configure tdata1: type=mcontrol, execute bit set
-    tdata1_value = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_EXECUTE
-    await write_csr(dut, CSR_TDATA1, tdata1_value & 0xFFF)
-    
-    # Configure tdata2: trigger address
-    await write_csr(dut, CSR_TDATA2, trigger_pc & 0xFFF)
-    
-    await ClockCycles(dut.clk, 5)
+    # Trigger 0: type=mcontrol, execute bit set, tdata2 = trigger address
+    poke_trigger(dut, 0, TDATA1_EXEC, trigger_pc)
+    await ClockCycles(dut.clk, 1)
     
     # Verify configuration didn't trigger
-    post_config_trigger = int(dut.trigger_fire.value)
-    post_config_debug = int(dut.debug_mode_o.value)
+    post_config_trigger, post_config_debug = snapshot(dut)
     assert post_config_trigger == 0, \
         f"Trigger should not fire after config, got {post_config_trigger}"
     assert post_config_debug == 0, \
         f"Should not enter debug mode after config, got {post_config_debug}"
     
     # Execute instructions at different addresses (should not trigger)
-    dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = encode_nop()
-    await RisingEdge(dut.clk)
-    await ClockCycles(dut.clk, 2)
+    await _stream_instrs(dut, [encode_nop()])
     
     # Verify still not in debug mode
-    debug_mode_before = int(dut.debug_mode_o.value)
-    trigger_fire_before = int(dut.trigger_fire.value)
+    trigger_fire_before, debug_mode_before = snapshot(dut)
     assert debug_mode_before == 0, \
         f"Should not be in debug mode before PC match, got {debug_mode_before}"
     assert trigger_fire_before == 0, \
         f"Trigger should not fire before PC match, got {trigger_fire_before}"
     
-    dut._log.info(f"✓ Execution trigger test passed - " +
-                  f"trigger_fire={trigger_fire_before}, " +
-                  f"debug_mode={debug_mode_before}")
+    dut._log.info("✓ Execution trigger test passed - trigger_fire=%s, debug_mode=%s",
+                  trigger_fire_before, debug_mode_before)
 
 
 @cocotb.test()
 async def test_trigger_fire_signal(dut):
     """Test trigger_fire_o output signal with strict assertions."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing trigger fire signal")
     
     # Initially, trigger should not be fired
     await ClockCycles(dut.clk, 2)
-    trigger_fire_initial = int(dut.trigger_fire.value)
+    trigger_fire_initial = dut.trigger_fire.value
     assert trigger_fire_initial == 0, \
         f"Trigger should not be fired initially, got {trigger_fire_initial}"
-    dut._log.info(f"✓ Initial trigger_fire_o: {trigger_fire_initial}")
+    dut._log.info("✓ Initial trigger_fire_o: %s", trigger_fire_initial)
     
-    # Configure a simple trigger
-    await write_csr(dut, CSR_TSELECT, 0)
-    tdata1_value = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_EXECUTE
-    await write_csr(dut, CSR_TDATA1, tdata1_value & 0xFFF)
-    
-    await ClockCycles(dut.clk, 5)
+    # Configure a simple trigger; tdata2 must be unreachable, since inst_pc
+    # is still 0 (START_ADDR) right after soft_reset
+    poke_trigger(dut, 0, TDATA1_EXEC, UNREACHABLE_PC)
+    await ClockCycles(dut.clk, 1)
     
     # Verify trigger still not fired after configuration
-    trigger_fire_after_config = int(dut.trigger_fire.value)
+    trigger_fire_after_config, debug_mode_after_config = snapshot(dut)
     assert trigger_fire_after_config == 0, \
         f"Trigger should not fire after config alone, got {trigger_fire_after_config}"
+    assert debug_mode_after_config == 0, \
+        f"Should not enter debug mode after config alone, got {debug_mode_after_config}"
     
     dut._log.info("✓ Trigger fire signal test passed")
 
@@ -297,7 +374,7 @@ async def test_trigger_fire_signal(dut):
 @cocotb.test()
 async def test_load_store_trigger(dut):
     """Test load/store memory watchpoint triggers with assertions."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing load/store trigger")
     
@@ -305,72 +382,51 @@ async def test_load_store_trigger(dut):
     watch_addr = 0x200
     
     # Verify initial state
-    initial_trigger = int(dut.trigger_fire.value)
-    initial_debug = int(dut.debug_mode_o.value)
+    initial_trigger, initial_debug = snapshot(dut)
     assert initial_trigger == 0, f"Initial trigger should be 0, got {initial_trigger}"
     assert initial_debug == 0, f"Initial debug mode should be 0, got {initial_debug}"
     
-    # Select trigger 1
-    await write_csr(dut, CSR_TSELECT, 1)
-    
-    # Configure tdata1: type=mcontrol, load bit set
-    tdata1_value = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_LOAD
-    await write_csr(dut, CSR_TDATA1, tdata1_value & 0xFFF)
-    
-    # Configure tdata2: watch address
-    await write_csr(dut, CSR_TDATA2, watch_addr & 0xFFF)
-    
-    await ClockCycles(dut.clk, 5)
+    # Trigger 1: type=mcontrol, load bit set, tdata2 = watch address
+    poke_trigger(dut, 1, TDATA1_LOAD, watch_addr)
+    await ClockCycles(dut.clk, 1)
     
     # Verify configuration didn't trigger
-    post_config_trigger = int(dut.trigger_fire.value)
+    post_config_trigger = dut.trigger_fire.value
     assert post_config_trigger == 0, \
         f"Trigger should not fire after config, got {post_config_trigger}"
     
     # Execute a load instruction to a different address (0x100, not 0x200)
     # LW x4, 0(x5) where x5 = 0x100
-    dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = encode_addi(5, 0, 0x100)
-    await RisingEdge(dut.clk)
-    await ClockCycles(dut.clk, 2)
-    
-    dut.imem_rvalid.value = 1
-    dut.imem_rdata.value = encode_lw(4, 5, 0)
-    await RisingEdge(dut.clk)
-    dut.imem_rvalid.value = 0
-    
-    # Respond to memory read
-    await ClockCycles(dut.clk, 2)
-    dut.dmem_rvalid.value = 1
-    dut.dmem_rdata.value = 0x12345678
-    await RisingEdge(dut.clk)
-    dut.dmem_rvalid.value = 0
+    await _stream_instrs(dut, [encode_addi(5, 0, 0x100)])
     
-    await ClockCycles(dut.clk, 5)
+    # Answer the load as soon as the core asks for it
+    cocotb.start_soon(_serve_dmem_read(dut, 0x12345678))
+    await _stream_instrs(dut, [encode_lw(4, 5, 0)])
+    await ClockCycles(dut.clk, 6)
     
     # Verify no trigger on different address
-    final_trigger = int(dut.trigger_fire.value)
-    final_debug = int(dut.debug_mode_o.value)
+    final_trigger, final_debug = snapshot(dut)
     assert final_trigger == 0, \
         f"Trigger should not fire for different address, got {final_trigger}"
     assert final_debug == 0, \
         f"Should not enter debug mode, got {final_debug}"
     
-    dut._log.info(f"✓ Load/store trigger test passed - " +
-                  f"trigger={final_trigger}, debug={final_debug}")
+    dut._log.info("✓ Load/store trigger test passed - trigger=%s, debug=%s",
+                  final_trigger, final_debug)
 
 
 @cocotb.test()
 async def test_external_trigger(dut):
     """Test external trigger (icount type) with direct CSR access."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing external trigger")
     
     # Check if we're in debug mode after reset
-    debug_mode_initial = int(dut.debug_mode_o.value)
+    debug_mode_initial = dut.debug_mode_o.value
     if debug_mode_initial != 0:
-        dut._log.warning(f"Starting in debug mode ({debug_mode_initial}), forcing normal mode for test")
+        dut._log.warning("Starting in debug mode (%s), forcing normal mode for test",
+                         debug_mode_initial)
         # Force clear debug mode for testing (direct register access)
         dut.debug_mode_o.value = 0
         await ClockCycles(dut.clk, 2)
@@ -379,27 +435,24 @@ async def test_external_trigger(dut):
     # tdata1[31:28] = 7 (tmexttrigger)
     # tdata1[19:16] = 2 (select: use external trigger input 2)
     # tdata1[15:12] = 1 (action: enter debug mode)
-    tdata1_value = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (2 << 16) | (1 << 12)
-    dut.tdata1[2].value = tdata1_value
+    poke_trigger(dut, 2, TDATA1_EXT2)
     
     await ClockCycles(dut.clk, 2)
     
     # Verify configuration
     actual_tdata1 = int(dut.tdata1[2].value)
-    dut._log.info(f"Configured trigger 2: tdata1=0x{actual_tdata1:08x}")
+    dut._log.info("Configured trigger 2: tdata1=0x%08x", actual_tdata1)
     
     await ClockCycles(dut.clk, 2)
     
     # Check initial state - no trigger fired
-    trigger_fire_before = int(dut.trigger_fire.value)
-    debug_mode_before = int(dut.debug_mode_o.value)
+    trigger_fire_before, debug_mode_before = snapshot(dut)
     assert trigger_fire_before == 0, \
         f"Initial trigger should be 0, got {trigger_fire_before}"
     assert debug_mode_before == 0, \
         f"Initial debug mode should be 0, got {debug_mode_before}"
-    dut._log.info(f"✓ Before external trigger - " +
-                  f"trigger_fire={trigger_fire_before}, " +
-                  f"debug_mode={debug_mode_before}")
+    dut._log.info("✓ Before external trigger - trigger_fire=%s, debug_mode=%s",
+                  trigger_fire_before, debug_mode_before)
     
     # Assert external trigger input for trigger 2
     dut.i_external_trigger.value = 0b0100  # Trigger 2
@@ -407,142 +460,100 @@ async def test_external_trigger(dut):
     
     # Check if trigger caused debug mode entry
     # Note: trigger_fire may be internal and debug_mode is the observable effect
-    debug_mode_after = int(dut.debug_mode_o.value)
+    debug_mode_after = dut.debug_mode_o.value
     ext_trigger_val = int(dut.i_external_trigger.value)
     tdata1_val = int(dut.tdata1[2].value)
     
-    dut._log.info(f"After external trigger: i_external_trigger=0x{ext_trigger_val:x}, " +
-                  f"tdata1[2]=0x{tdata1_val:08x}, " +
-                  f"debug_mode={debug_mode_after}")
+    dut._log.info("After external trigger: i_external_trigger=0x%x, "
+                  "tdata1[2]=0x%08x, debug_mode=%s",
+                  ext_trigger_val, tdata1_val, debug_mode_after)
     
     # The key success condition: external trigger should cause debug mode entry
     assert debug_mode_after == 1, \
         f"Should enter debug mode due to external trigger, got {debug_mode_after}"
     
-    dut._log.info(f"✓ External trigger successfully entered debug mode")
+    dut._log.info("✓ External trigger successfully entered debug mode")
     
     # Clear external trigger
     dut.i_external_trigger.value = 0
     await ClockCycles(dut.clk, 3)
     
     # Verify trigger clears but debug mode persists
-    trigger_fire_cleared = int(dut.trigger_fire.value)
-    debug_mode_persistent = int(dut.debug_mode_o.value)
+    trigger_fire_cleared, debug_mode_persistent = snapshot(dut)
     assert trigger_fire_cleared == 0, \
         f"Trigger should clear when input removed, got {trigger_fire_cleared}"
     assert debug_mode_persistent == 1, \
         f"Debug mode should persist, got {debug_mode_persistent}"
     
-    dut._log.info(f"✓ External trigger test passed - " +
-                  f"final trigger={trigger_fire_cleared}, " +
-                  f"debug_mode={debug_mode_persistent}")
+    dut._log.info("✓ External trigger test passed - final trigger=%s, debug_mode=%s",
+                  trigger_fire_cleared, debug_mode_persistent)
 
 
 @cocotb.test()
 async def test_multiple_triggers(dut):
     """Test multiple trigger configuration with assertions."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing multiple triggers")
     
     # Verify clean initial state
-    initial_trigger = int(dut.trigger_fire.value)
-    initial_debug = int(dut.debug_mode_o.value)
+    initial_trigger, initial_debug = snapshot(dut)
     assert initial_trigger == 0, f"Initial trigger should be 0, got {initial_trigger}"
     assert initial_debug == 0, f"Initial debug should be 0, got {initial_debug}"
     
-    # Configure trigger 0: execution trigger
-    await write_csr(dut, CSR_TSELECT, 0)
-    tdata1_exec = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_EXECUTE
-    await write_csr(dut, CSR_TDATA1, tdata1_exec & 0xFFF)
-    await write_csr(dut, CSR_TDATA2, 0x100)
-    await ClockCycles(dut.clk, 2)
+    # (index, tdata1, tdata2) for execute, load, store and icount triggers
+    configs = (
+        (0, TDATA1_EXEC, 0x100),
+        (1, TDATA1_LOAD, 0x200),
+        (2, TDATA1_STORE, 0x300),
+        (3, TDATA1_ICOUNT1, None),
+    )
+    for idx, tdata1, tdata2 in configs:
+        poke_trigger(dut, idx, tdata1, tdata2)
     
-    # Verify no spurious trigger after config 0
-    trigger_after_0 = int(dut.trigger_fire.value)
-    assert trigger_after_0 == 0, \
-        f"No trigger after config 0, got {trigger_after_0}"
-    
-    # Configure trigger 1: load trigger
-    await write_csr(dut, CSR_TSELECT, 1)
-    tdata1_load = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_LOAD
-    await write_csr(dut, CSR_TDATA1, tdata1_load & 0xFFF)
-    await write_csr(dut, CSR_TDATA2, 0x200)
-    await ClockCycles(dut.clk, 2)
-    
-    # Verify no spurious trigger after config 1
-    trigger_after_1 = int(dut.trigger_fire.value)
-    assert trigger_after_1 == 0, \
-        f"No trigger after config 1, got {trigger_after_1}"
-    
-    # Configure trigger 2: store trigger
-    await write_csr(dut, CSR_TSELECT, 2)
-    tdata1_store = (TRIGGER_TYPE_MCONTROL << 28) | MCONTROL_STORE
-    await write_csr(dut, CSR_TDATA1, tdata1_store & 0xFFF)
-    await write_csr(dut, CSR_TDATA2, 0x300)
-    await ClockCycles(dut.clk, 2)
-    
-    # Verify no spurious trigger after config 2
-    trigger_after_2 = int(dut.trigger_fire.value)
-    assert trigger_after_2 == 0, \
-        f"No trigger after config 2, got {trigger_after_2}"
-    
-    # Configure trigger 3: external trigger
-    await write_csr(dut, CSR_TSELECT, 3)
-    tdata1_ext = (TRIGGER_TYPE_ICOUNT << 28) | 0x1
-    await write_csr(dut, CSR_TDATA1, tdata1_ext & 0xFFF)
-    await ClockCycles(dut.clk, 2)
-    
-    # Verify no spurious trigger after config 3
-    trigger_after_3 = int(dut.trigger_fire.value)
-    assert trigger_after_3 == 0, \
-        f"No trigger after config 3, got {trigger_after_3}"
-    
-    await ClockCycles(dut.clk, 3)
+    await ClockCycles(dut.clk, 8)
     
     # Final verification
-    final_trigger = int(dut.trigger_fire.value)
-    final_debug = int(dut.debug_mode_o.value)
+    final_trigger, final_debug = snapshot(dut)
     assert final_trigger == 0, \
         f"Final trigger should be 0, got {final_trigger}"
     assert final_debug == 0, \
         f"Final debug should be 0, got {final_debug}"
     
     dut._log.info("✓ Multiple triggers configured successfully")
-    dut._log.info(f"✓ All 4 triggers configured without spurious firing")
+    dut._log.info("✓ All %d triggers configured without spurious firing", len(configs))
 
 
 @cocotb.test()
 async def test_trigger_priority(dut):
     """Test trigger priority over haltreq with direct CSR access."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing trigger priority")
     
     # Check if we're in debug mode after reset
-    debug_mode_initial = int(dut.debug_mode_o.value)
+    debug_mode_initial = dut.debug_mode_o.value
     if debug_mode_initial != 0:
-        dut._log.warning(f"Starting in debug mode ({debug_mode_initial}), forcing normal mode for test")
+        dut._log.warning("Starting in debug mode (%s), forcing normal mode for test",
+                         debug_mode_initial)
         # Force clear debug mode for testing (direct register access)
         dut.debug_mode_o.value = 0
         await ClockCycles(dut.clk, 2)
     
     # Verify initial state
-    initial_trigger = int(dut.trigger_fire.value)
-    initial_debug = int(dut.debug_mode_o.value)
+    initial_trigger, initial_debug = snapshot(dut)
     assert initial_trigger == 0, f"Initial trigger should be 0, got {initial_trigger}"
     assert initial_debug == 0, f"Initial debug should be 0, got {initial_debug}"
     
     # Configure an external trigger - direct CSR write
     # tmexttrigger type=7, select=0 (use external trigger input 0), action=1 (debug mode)
-    tdata1_value = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (0 << 16) | (1 << 12)
-    dut.tdata1[0].value = tdata1_value
+    poke_trigger(dut, 0, TDATA1_EXT0)
     
     await ClockCycles(dut.clk, 2)
     
     # Verify configuration
     actual_tdata1 = int(dut.tdata1[0].value)
-    dut._log.info(f"Configured trigger 0: tdata1=0x{actual_tdata1:08x}")
+    dut._log.info("Configured trigger 0: tdata1=0x%08x", actual_tdata1)
     
     await ClockCycles(dut.clk, 1)
     
@@ -554,13 +565,13 @@ async def test_trigger_priority(dut):
     
     # Check which one took priority (trigger should win)
     # Debug mode entry is the observable effect
-    debug_mode = int(dut.debug_mode_o.value)
+    debug_mode = dut.debug_mode_o.value
     
     # Debug mode should be entered (trigger has higher priority)
     assert debug_mode == 1, \
         f"Debug mode should be entered due to trigger priority, got {debug_mode}"
     
-    dut._log.info(f"✓ Trigger has priority - debug_mode={debug_mode}")
+    dut._log.info("✓ Trigger has priority - debug_mode=%s", debug_mode)
     
     # Clear signals
     dut.i_external_trigger.value = 0
@@ -569,8 +580,7 @@ async def test_trigger_priority(dut):
     await ClockCycles(dut.clk, 3)
     
     # Verify trigger clears but debug persists
-    trigger_cleared = int(dut.trigger_fire.value)
-    debug_persistent = int(dut.debug_mode_o.value)
+    trigger_cleared, debug_persistent = snapshot(dut)
     assert trigger_cleared == 0, \
         f"Trigger should clear, got {trigger_cleared}"
     assert debug_persistent == 1, \
@@ -582,12 +592,12 @@ async def test_trigger_priority(dut):
 @cocotb.test()
 async def test_trigger_in_debug_mode(dut):
     """Test that triggers don't fire in debug mode with assertions."""
-    await init_dut(dut)
+    await soft_reset(dut)
     
     dut._log.info("Testing trigger behavior in debug mode")
     
     # Verify initial state
-    initial_debug = int(dut.debug_mode_o.value)
+    initial_debug = dut.debug_mode_o.value
     assert initial_debug == 0, f"Should start in normal mode, got {initial_debug}"
     
     # Enter debug mode via haltreq
@@ -597,15 +607,14 @@ async def test_trigger_in_debug_mode(dut):
     await ClockCycles(dut.clk, 1)
     
     # Verify we're in debug mode
-    debug_mode_entered = int(dut.debug_mode_o.value)
+    debug_mode_entered = dut.debug_mode_o.value
     assert debug_mode_entered == 1, \
         f"Should enter debug mode via haltreq, got {debug_mode_entered}"
-    dut._log.info(f"✓ Entered debug mode: {debug_mode_entered}")
+    dut._log.info("✓ Entered debug mode: %s", debug_mode_entered)
     
     # Configure a trigger while in debug mode
     await write_csr_full(dut, CSR_TSELECT, 0)
-    tdata1_value = (TRIGGER_TYPE_ICOUNT << 28) | 0x1
-    await write_csr_full(dut, CSR_TDATA1, tdata1_value)
+    await write_csr_full(dut, CSR_TDATA1, TDATA1_ICOUNT1)
     
     await ClockCycles(dut.clk, 2)
     
@@ -614,24 +623,22 @@ async def test_trigger_in_debug_mode(dut):
     await ClockCycles(dut.clk, 2)
     
     # Trigger should NOT fire (already in debug mode)
-    trigger_fire = int(dut.trigger_fire.value)
-    debug_mode_still = int(dut.debug_mode_o.value)
+    trigger_fire, debug_mode_still = snapshot(dut)
     
     assert trigger_fire == 0, \
         f"Trigger should NOT fire in debug mode, got {trigger_fire}"
     assert debug_mode_still == 1, \
         f"Should still be in debug mode, got {debug_mode_still}"
     
-    dut._log.info(f"✓ Trigger correctly suppressed in debug mode - " +
-                  f"trigger_fire={trigger_fire}, debug_mode={debug_mode_still}")
+    dut._log.info("✓ Trigger correctly suppressed in debug mode - trigger_fire=%s, debug_mode=%s",
+                  trigger_fire, debug_mode_still)
     
     # Clear trigger
     dut.i_external_trigger.value = 0
     await ClockCycles(dut.clk, 3)
     
     # Final verification
-    final_trigger = int(dut.trigger_fire.value)
-    final_debug = int(dut.debug_mode_o.value)
+    final_trigger, final_debug = snapshot(dut)
     assert final_trigger == 0, \
         f"Trigger should remain 0, got {final_trigger}"
     assert final_debug == 1, \
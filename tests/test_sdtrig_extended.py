@@ -10,62 +10,76 @@ Tests for:
 - tcontrol, tinfo, tdata3, mcontext CSRs
 """
 import cocotb
-from cocotb.triggers import ClockCycles
-from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, Edge, First
 
-# CSR addresses
-CSR_TSELECT = 0x7A0
-CSR_TDATA1 = 0x7A1
-CSR_TDATA2 = 0x7A2
-CSR_TDATA3 = 0x7A3
-CSR_TINFO = 0x7A4
-CSR_TCONTROL = 0x7A5
-CSR_MCONTEXT = 0x7A8
+from _tb_common import (
+    CSR_MCONTEXT,
+    CSR_TCONTROL,
+    CSR_TDATA1,
+    CSR_TDATA2,
+    CSR_TDATA3,
+    TDATA1_EXT0,
+    TDATA1_EXT1,
+    TRIGGER_TYPE_ETRIGGER,
+    TRIGGER_TYPE_ICOUNT,
+    TRIGGER_TYPE_ITRIGGER,
+    TRIGGER_TYPE_MCONTROL6,
+    check_csr,
+    csr_write,
+    init_dut,
+    select_trigger,
+    set_trigger,
+)
 
-# Trigger types
-TRIGGER_TYPE_MCONTROL = 0x2
-TRIGGER_TYPE_ICOUNT = 0x3
-TRIGGER_TYPE_ITRIGGER = 0x4
-TRIGGER_TYPE_ETRIGGER = 0x5
-TRIGGER_TYPE_MCONTROL6 = 0x6
-TRIGGER_TYPE_TMEXTTRIGGER = 0x7
+# tdata1 encodings used by the tests (m-mode, action = 1 unless noted)
+# icount: [23:10] count = 5, [9] m, [6:5] action
+TDATA1_ICOUNT5 = (TRIGGER_TYPE_ICOUNT << 28) | (5 << 10) | (1 << 9) | (1 << 5)
+# itrigger / etrigger: [9] m, [7:6] action = debug
+TDATA1_ITRIGGER = (TRIGGER_TYPE_ITRIGGER << 28) | (1 << 9) | (1 << 6)
+TDATA1_ETRIGGER = (TRIGGER_TYPE_ETRIGGER << 28) | (1 << 9) | (1 << 6)
+# mcontrol6: [16:12] select = execute, [6:5] action, [2] m
+TDATA1_MCONTROL6_EXEC = (TRIGGER_TYPE_MCONTROL6 << 28) | (0 << 12) | (1 << 5) | (1 << 2)
+# Execute address the firmware never fetches
+UNREACHABLE_PC = 0xFFFF_FFF0
 
-DEFAULT_CLK_PERIOD_NS = 10
-DEFAULT_RESET_CYCLES = 5
+# Read/write trigger CSRs checked by a CSR write and readback:
+# name -> (CSR address, handle on dut.cpu, write value, read mask, reset value)
+CSR_TABLE = {
+    "tcontrol": (CSR_TCONTROL, lambda cpu: cpu.tcontrol, 0x00000000, 0x00000008, 0x00000008),
+    "tdata3": (CSR_TDATA3, lambda cpu: cpu.tdata3[0], 0xDEADBEEF, 0xFFFFFFFF, 0x00000000),
+    "mcontext": (CSR_MCONTEXT, lambda cpu: cpu.mcontext, 0x12345678, 0xFFFFFFFF, 0x00000000),
+}
 
 
-async def init_dut(dut, clk_period_ns=None, reset_cycles=None):
-    """Initialize DUT with clock and reset."""
-    if clk_period_ns is None:
-        clk_period_ns = DEFAULT_CLK_PERIOD_NS
-    if reset_cycles is None:
-        reset_cycles = DEFAULT_RESET_CYCLES
-
-    cocotb.start_soon(Clock(dut.clk, clk_period_ns, units="ns").start())
-
-    dut.reset_n.value = 0
-    dut.dmem_wready.value = 1
-    dut.dmem_rvalid.value = 0
-    dut.imem_rvalid.value = 1
-    dut.i_haltreq.value = 0
-    dut.i_external_trigger.value = 0
-
-    await ClockCycles(dut.clk, reset_cycles)
-    dut.reset_n.value = 1
-    await ClockCycles(dut.clk, 2)
+async def _csr_register(dut, name):
+    """Check a CSR_TABLE entry's reset value and write, then restore it."""
+    csr, handle, wval, rmask, reset = CSR_TABLE[name]
+    sig = handle(dut.cpu)
+    
+    initial = int(sig.value)
+    assert initial & rmask == reset, (
+        f"{name} should reset to 0x{reset:08x}, got 0x{initial:08x}"
+    )
+    rval = await check_csr(dut, csr, sig, wval, wval & rmask, rmask)
+    dut._log.debug("%s: reset 0x%08x, wrote 0x%08x, read 0x%08x", name, initial, wval, rval)
+    
+    await csr_write(dut, csr, reset)
+    
+    dut._log.info("✓ %s register access works correctly", name)
 
 
 @cocotb.test()
 async def test_tinfo_register(dut):
     """Test tinfo register reports supported trigger types."""
     await init_dut(dut)
+    cpu = dut.cpu
     
-    dut._log.info("Testing tinfo register")
+    dut._log.debug("Testing tinfo register")
     
     # Read tinfo - should report types 2,3,4,5,6,7 supported
-    tinfo_value = int(dut.cpu.tinfo.value)
+    tinfo_value = int(cpu.tinfo.value)
     
-    dut._log.info(f"tinfo value: 0x{tinfo_value:08x} (binary: 0b{tinfo_value:032b})")
+    dut._log.debug("tinfo value: 0x%08x", tinfo_value)
     
     # Check each type bit
     # bit 2 = type 2 (mcontrol)
@@ -90,84 +104,54 @@ async def test_tcontrol_register(dut):
     """Test tcontrol register controls M-mode trigger enable."""
     await init_dut(dut)
     
-    dut._log.info("Testing tcontrol register")
-    
-    # Check initial tcontrol value (mte should be 1 by default)
-    initial_tcontrol = int(dut.cpu.tcontrol.value)
-    mte_bit = (initial_tcontrol >> 3) & 0x1
-    
-    dut._log.info(f"Initial tcontrol: 0x{initial_tcontrol:08x}, mte={mte_bit}")
-    assert mte_bit == 1, "M-mode trigger enable should be 1 by default"
-    
-    # Write to tcontrol to disable M-mode triggers
-    dut.cpu.tcontrol.value = 0x00000000  # mte=0
-    await ClockCycles(dut.clk, 2)
-    
-    new_tcontrol = int(dut.cpu.tcontrol.value)
-    new_mte = (new_tcontrol >> 3) & 0x1
-    
-    dut._log.info(f"After write: tcontrol=0x{new_tcontrol:08x}, mte={new_mte}")
-    assert new_mte == 0, "mte should be 0 after write"
-    
-    # Re-enable for subsequent tests
-    dut.cpu.tcontrol.value = 0x00000008  # mte=1
-    await ClockCycles(dut.clk, 2)
+    dut._log.debug("Testing tcontrol register")
     
-    dut._log.info("✓ tcontrol register access works correctly")
+    # mte (bit 3) resets to 1; write 0 to disable M-mode triggers, then
+    # restore it for subsequent tests
+    await _csr_register(dut, "tcontrol")
 
 
-@cocotb.test()
-async def test_type3_icount_trigger(dut):
+async def _type3_icount_trigger(dut):
     """Test type 3 (icount) instruction count trigger."""
-    await init_dut(dut)
+    cpu = dut.cpu
+    tdata1_0 = cpu.tdata1[0]
     
-    dut._log.info("Testing type 3 (icount) instruction count trigger")
+    dut._log.debug("Testing type 3 (icount) instruction count trigger")
     
     # Configure trigger 0: type=3 (icount), count=5, m=1, action=1
     # tdata1[31:28]=3 (icount), [23:10]=5 (count), [9]=1 (m-mode), [6:5]=1 (action)
-    count_value = 5
-    tdata1_value = (TRIGGER_TYPE_ICOUNT << 28) | (count_value << 10) | (1 << 9) | (1 << 5)
-    
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
+    set_trigger(cpu, 0, TDATA1_ICOUNT5)
     
     await ClockCycles(dut.clk, 3)
     
     # Check icount counter initialized (after tdata1 write takes effect)
-    counter_value = int(dut.cpu.icount_counter[0].value) & 0x3FFF
-    dut._log.info(f"Initial icount counter: {counter_value}")
+    counter_value = int(cpu.icount_counter[0].value) & 0x3FFF
+    dut._log.debug("Initial icount counter: %s", counter_value)
     
     # Note: Counter initialization happens on tdata1 write in proc_state==IMEM_DONE
     # In simulation without real instructions, counter may not update as expected
     # This test verifies the configuration is accepted and counter exists
     
-    trigger_type = (int(dut.cpu.tdata1[0].value) >> 28) & 0xF
+    trigger_type = (int(tdata1_0.value) >> 28) & 0xF
     assert trigger_type == TRIGGER_TYPE_ICOUNT, f"Type should be 3, got {trigger_type}"
     
-    dut._log.info(f"✓ icount trigger configured correctly (type={trigger_type}, counter={counter_value})")
+    dut._log.info("✓ icount trigger configured correctly (type=%s, counter=%s)", trigger_type, counter_value)
 
 
-@cocotb.test()
-async def test_type4_itrigger(dut):
+async def _type4_itrigger(dut):
     """Test type 4 (itrigger) interrupt trigger."""
-    await init_dut(dut)
+    cpu = dut.cpu
+    tdata1_0 = cpu.tdata1[0]
     
-    dut._log.info("Testing type 4 (itrigger) interrupt trigger")
+    dut._log.debug("Testing type 4 (itrigger) interrupt trigger")
     
     # Configure trigger 0: type=4 (itrigger), m=1, action=1
     # tdata1[31:28]=4, [9]=1 (m-mode), [7:6]=1 (action=debug)
-    tdata1_value = (TRIGGER_TYPE_ITRIGGER << 28) | (1 << 9) | (1 << 6)
-    
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
-    
-    await ClockCycles(dut.clk, 2)
-    
-    # Verify configuration
-    actual_tdata1 = int(dut.cpu.tdata1[0].value)
+    select_trigger(cpu, 0)
+    actual_tdata1 = await check_csr(dut, CSR_TDATA1, tdata1_0, TDATA1_ITRIGGER, TDATA1_ITRIGGER)
     trigger_type = (actual_tdata1 >> 28) & 0xF
     
-    dut._log.info(f"Configured itrigger: tdata1=0x{actual_tdata1:08x}, type={trigger_type}")
+    dut._log.debug("Configured itrigger: tdata1=0x%08x, type=%s", actual_tdata1, trigger_type)
     assert trigger_type == TRIGGER_TYPE_ITRIGGER, f"Type should be 4, got {trigger_type}"
     
     # Note: Full interrupt trigger testing requires interrupt mechanism
@@ -176,27 +160,20 @@ async def test_type4_itrigger(dut):
     dut._log.info("✓ itrigger configuration works correctly")
 
 
-@cocotb.test()
-async def test_type5_etrigger(dut):
+async def _type5_etrigger(dut):
     """Test type 5 (etrigger) exception trigger."""
-    await init_dut(dut)
+    cpu = dut.cpu
+    tdata1_0 = cpu.tdata1[0]
     
-    dut._log.info("Testing type 5 (etrigger) exception trigger")
+    dut._log.debug("Testing type 5 (etrigger) exception trigger")
     
     # Configure trigger 0: type=5 (etrigger), m=1, action=1
     # tdata1[31:28]=5, [9]=1 (m-mode), [7:6]=1 (action=debug)
-    tdata1_value = (TRIGGER_TYPE_ETRIGGER << 28) | (1 << 9) | (1 << 6)
-    
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
-    
-    await ClockCycles(dut.clk, 2)
-    
-    # Verify configuration
-    actual_tdata1 = int(dut.cpu.tdata1[0].value)
+    select_trigger(cpu, 0)
+    actual_tdata1 = await check_csr(dut, CSR_TDATA1, tdata1_0, TDATA1_ETRIGGER, TDATA1_ETRIGGER)
     trigger_type = (actual_tdata1 >> 28) & 0xF
     
-    dut._log.info(f"Configured etrigger: tdata1=0x{actual_tdata1:08x}, type={trigger_type}")
+    dut._log.debug("Configured etrigger: tdata1=0x%08x, type=%s", actual_tdata1, trigger_type)
     assert trigger_type == TRIGGER_TYPE_ETRIGGER, f"Type should be 5, got {trigger_type}"
     
     # Note: Full exception trigger testing requires exception mechanism
@@ -205,34 +182,29 @@ async def test_type5_etrigger(dut):
     dut._log.info("✓ etrigger configuration works correctly")
 
 
-@cocotb.test()
-async def test_type6_mcontrol6(dut):
+async def _type6_mcontrol6(dut):
     """Test type 6 (mcontrol6) enhanced address/data match trigger."""
-    await init_dut(dut)
+    cpu = dut.cpu
+    tdata1_0 = cpu.tdata1[0]
+    tdata2_0 = cpu.tdata2[0]
     
-    dut._log.info("Testing type 6 (mcontrol6) enhanced trigger")
+    dut._log.debug("Testing type 6 (mcontrol6) enhanced trigger")
     
-    # Get current PC
-    await ClockCycles(dut.clk, 2)
-    current_pc = int(dut.cpu.pc.value)
-    target_pc = current_pc + 0x20
-    
-    # Configure trigger 0: type=6 (mcontrol6), select=0 (execute), m=1, action=1
+    # Configure trigger 0 with CSR writes: type=6 (mcontrol6), select=0
+    # (execute), m=1, action=1. tdata2 goes first and never matches, so the
+    # armed trigger cannot halt the firmware.
     # tdata1[31:28]=6, [16:12]=0 (execute), [6:5]=1 (action), [2]=1 (m-mode)
-    tdata1_value = (TRIGGER_TYPE_MCONTROL6 << 28) | (0 << 12) | (1 << 5) | (1 << 2)
-    
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
-    dut.cpu.tdata2[0].value = target_pc
-    
-    await ClockCycles(dut.clk, 2)
+    target_pc = UNREACHABLE_PC
+    select_trigger(cpu, 0)
+    await csr_write(dut, CSR_TDATA2, target_pc)
+    await csr_write(dut, CSR_TDATA1, TDATA1_MCONTROL6_EXEC)
     
     # Verify configuration
-    actual_tdata1 = int(dut.cpu.tdata1[0].value)
-    actual_tdata2 = int(dut.cpu.tdata2[0].value)
+    actual_tdata1 = int(tdata1_0.value)
+    actual_tdata2 = int(tdata2_0.value)
     trigger_type = (actual_tdata1 >> 28) & 0xF
     
-    dut._log.info(f"Configured mcontrol6: type={trigger_type}, tdata2=0x{actual_tdata2:08x}")
+    dut._log.debug("Configured mcontrol6: type=%s, tdata2=0x%08x", trigger_type, actual_tdata2)
     assert trigger_type == TRIGGER_TYPE_MCONTROL6, f"Type should be 6, got {trigger_type}"
     assert actual_tdata2 == target_pc, f"tdata2 should be 0x{target_pc:08x}, got 0x{actual_tdata2:08x}"
     
@@ -243,37 +215,35 @@ async def test_type6_mcontrol6(dut):
 async def test_action_8_external_output(dut):
     """Test action=8 drives external trigger output chain 0."""
     await init_dut(dut)
+    cpu = dut.cpu
+    ext_out = dut.o_external_trigger
     
-    dut._log.info("Testing action=8 (external output chain 0)")
+    dut._log.debug("Testing action=8 (external output chain 0)")
     
     # Check initial state
-    initial_ext = int(dut.o_external_trigger.value)
+    initial_ext = int(ext_out.value)
     ext0_init = initial_ext & 0x1
     ext1_init = (initial_ext >> 1) & 0x1
     
     assert ext0_init == 0, f"Initial ext0 should be 0, got {ext0_init}"
     assert ext1_init == 0, f"Initial ext1 should be 0, got {ext1_init}"
     
-    dut._log.info(f"✓ Initial external outputs: 0b{initial_ext:02b}")
+    dut._log.debug("Initial external outputs: 0x%x", initial_ext)
     
     # Configure trigger 0: type=7, select=0, action=8
-    tdata1_value = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (0 << 16) | (8 << 12)
-    
-    dut.cpu.tselect.value = 0
-    dut.cpu.tdata1[0].value = tdata1_value
-    
-    await ClockCycles(dut.clk, 2)
+    set_trigger(cpu, 0, TDATA1_EXT0)
     
-    # Assert external trigger input
+    # Assert external trigger input in the same step as the configuration
     dut.i_external_trigger.value = 0b0001
-    await ClockCycles(dut.clk, 2)
+    # Wake on the output change; give up after the old 2-cycle window
+    await First(Edge(ext_out), ClockCycles(dut.clk, 2))
     
     # Check output
-    ext_after = int(dut.o_external_trigger.value)
+    ext_after = int(ext_out.value)
     ext0_after = ext_after & 0x1
     ext1_after = (ext_after >> 1) & 0x1
     
-    dut._log.info(f"After trigger: o_external_trigger=0b{ext_after:02b} (ext0={ext0_after}, ext1={ext1_after})")
+    dut._log.debug("After trigger: ext0=%d, ext1=%d", ext0_after, ext1_after)
     
     assert ext0_after == 1, f"ext0 should be 1 (action=8), got {ext0_after}"
     assert ext1_after == 0, f"ext1 should be 0, got {ext1_after}"
@@ -289,27 +259,25 @@ async def test_action_8_external_output(dut):
 async def test_action_9_external_output(dut):
     """Test action=9 drives external trigger output chain 1."""
     await init_dut(dut)
+    cpu = dut.cpu
+    ext_out = dut.o_external_trigger
     
-    dut._log.info("Testing action=9 (external output chain 1)")
+    dut._log.debug("Testing action=9 (external output chain 1)")
     
     # Configure trigger 1: type=7, select=1, action=9
-    tdata1_value = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (1 << 16) | (9 << 12)
-    
-    dut.cpu.tselect.value = 1
-    dut.cpu.tdata1[1].value = tdata1_value
-    
-    await ClockCycles(dut.clk, 2)
+    set_trigger(cpu, 1, TDATA1_EXT1)
     
-    # Assert external trigger input
+    # Assert external trigger input in the same step as the configuration
     dut.i_external_trigger.value = 0b0010
-    await ClockCycles(dut.clk, 2)
+    # Wake on the output change; give up after the old 2-cycle window
+    await First(Edge(ext_out), ClockCycles(dut.clk, 2))
     
     # Check output
-    ext_after = int(dut.o_external_trigger.value)
+    ext_after = int(ext_out.value)
     ext0_after = ext_after & 0x1
     ext1_after = (ext_after >> 1) & 0x1
     
-    dut._log.info(f"After trigger: o_external_trigger=0b{ext_after:02b} (ext0={ext0_after}, ext1={ext1_after})")
+    dut._log.debug("After trigger: ext0=%d, ext1=%d", ext0_after, ext1_after)
     
     assert ext0_after == 0, f"ext0 should be 0, got {ext0_after}"
     assert ext1_after == 1, f"ext1 should be 1 (action=9), got {ext1_after}"
@@ -325,22 +293,17 @@ async def test_action_9_external_output(dut):
 async def test_both_external_outputs_simultaneous(dut):
     """Test both external outputs can be active simultaneously."""
     await init_dut(dut)
+    cpu = dut.cpu
     
-    dut._log.info("Testing both external outputs simultaneously")
+    dut._log.debug("Testing both external outputs simultaneously")
     
     # Configure trigger 0: action=8, select=0
-    dut.cpu.tselect.value = 0
-    tdata1_t0 = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (0 << 16) | (8 << 12)
-    dut.cpu.tdata1[0].value = tdata1_t0
+    set_trigger(cpu, 0, TDATA1_EXT0)
     
     # Configure trigger 1: action=9, select=1
-    dut.cpu.tselect.value = 1
-    tdata1_t1 = (TRIGGER_TYPE_TMEXTTRIGGER << 28) | (1 << 16) | (9 << 12)
-    dut.cpu.tdata1[1].value = tdata1_t1
-    
-    await ClockCycles(dut.clk, 2)
+    set_trigger(cpu, 1, TDATA1_EXT1)
     
-    # Assert both external inputs
+    # Assert both external inputs in the same step as the configuration
     dut.i_external_trigger.value = 0b0011
     await ClockCycles(dut.clk, 2)
     
@@ -349,7 +312,7 @@ async def test_both_external_outputs_simultaneous(dut):
     ext0 = ext_value & 0x1
     ext1 = (ext_value >> 1) & 0x1
     
-    dut._log.info(f"Both triggers: o_external_trigger=0b{ext_value:02b}")
+    dut._log.debug("Both triggers: o_external_trigger=0x%x", ext_value)
     
     assert ext0 == 1, f"ext0 should be 1, got {ext0}"
     assert ext1 == 1, f"ext1 should be 1, got {ext1}"
@@ -362,47 +325,35 @@ async def test_both_external_outputs_simultaneous(dut):
     await ClockCycles(dut.clk, 2)
 
 
-@cocotb.test()
-async def test_tdata3_register(dut):
-    """Test tdata3 register read/write access."""
-    await init_dut(dut)
-    
-    dut._log.info("Testing tdata3 register")
-    
-    # Select trigger 0
-    dut.cpu.tselect.value = 0
+async def _clear_trigger0(dut):
+    """Return tselect and trigger 0's tdata registers to their reset values."""
+    cpu = dut.cpu
+    set_trigger(cpu, 0, 0, 0)
+    cpu.tdata3[0].value = 0
     await ClockCycles(dut.clk, 1)
-    
-    # Write to tdata3
-    test_value = 0xDEADBEEF
-    dut.cpu.tdata3[0].value = test_value
-    await ClockCycles(dut.clk, 2)
-    
-    # Read back
-    read_value = int(dut.cpu.tdata3[0].value)
-    
-    dut._log.info(f"tdata3 write: 0x{test_value:08x}, read: 0x{read_value:08x}")
-    assert read_value == test_value, f"tdata3 should be 0x{test_value:08x}, got 0x{read_value:08x}"
-    
-    dut._log.info("✓ tdata3 register access works correctly")
 
 
 @cocotb.test()
-async def test_mcontext_register(dut):
-    """Test mcontext register read/write access."""
+async def test_config_registers(dut):
+    """Check the config-only trigger types and CSRs after a single reset.
+    
+    The checks share one init_dut and clear trigger 0 between them instead
+    of resetting. The icount check runs last: its deposited tdata1 does not
+    load icount_counter, so the trigger fires on the next retired
+    instruction and leaves the core in debug mode.
+    """
     await init_dut(dut)
     
-    dut._log.info("Testing mcontext register")
-    
-    # Write to mcontext
-    test_value = 0x12345678
-    dut.cpu.mcontext.value = test_value
-    await ClockCycles(dut.clk, 2)
-    
-    # Read back
-    read_value = int(dut.cpu.mcontext.value)
+    for check in (
+        _type4_itrigger,
+        _type5_etrigger,
+        _type6_mcontrol6,
+    ):
+        await check(dut)
+        await _clear_trigger0(dut)
     
-    dut._log.info(f"mcontext write: 0x{test_value:08x}, read: 0x{read_value:08x}")
-    assert read_value == test_value, f"mcontext should be 0x{test_value:08x}, got 0x{read_value:08x}"
+    # _clear_trigger0 leaves trigger 0 selected for the tdata3 check
+    for name in ("tdata3", "mcontext"):
+        await _csr_register(dut, name)
     
-    dut._log.info("✓ mcontext register access works correctly")
+    await _type3_icount_trigger(dut)
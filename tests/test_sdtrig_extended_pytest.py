@@ -0,0 +1,34 @@
+"""Run the extended Sdtrig cocotb tests from pytest, one simulator run per testcase.
+
+Usage (from tests/):
+    pytest -n auto test_sdtrig_extended_pytest.py
+"""
+import pytest
+
+from sim_runner import (
+    MAKEFILE_BUILD_ARGS,
+    MAKEFILE_DEFINES,
+    MAKEFILE_ENV,
+    MAKEFILE_INCLUDES,
+    MAKEFILE_PARAMETERS,
+    MAKEFILE_SOURCES,
+    cocotb_testcases,
+    run_testcase,
+)
+
+TESTCASES = cocotb_testcases("test_sdtrig_extended")
+
+
+@pytest.mark.parametrize("testcase", TESTCASES)
+def test_sdtrig_extended(testcase):
+    run_testcase(
+        module="test_sdtrig_extended",
+        toplevel="top_with_ram_sim",
+        testcase=testcase,
+        sources=MAKEFILE_SOURCES,
+        includes=MAKEFILE_INCLUDES,
+        parameters=MAKEFILE_PARAMETERS,
+        defines=MAKEFILE_DEFINES,
+        build_args=MAKEFILE_BUILD_ARGS,
+        extra_env=MAKEFILE_ENV,
+    )
@@ -0,0 +1,33 @@
+"""Run the Sdtrig cocotb tests from pytest, one simulator run per testcase.
+
+Usage (from tests/):
+    pytest -n auto test_sdtrig_pytest.py
+"""
+import pytest
+
+from sim_runner import CORE_INCLUDES, CORE_SOURCES, cocotb_testcases, run_testcase
+
+TESTCASES = cocotb_testcases("test_sdtrig")
+
+# Same Verilator flags as run_sdtrig_tests.sh
+BUILD_ARGS = [
+    "-Wno-fatal",
+    "-Wno-PINMISSING",
+    "-Wno-IMPLICIT",
+    "-Wno-WIDTHEXPAND",
+    "-Wno-WIDTHTRUNC",
+    "-Wno-DECLFILENAME",
+]
+
+
+@pytest.mark.parametrize("testcase", TESTCASES)
+def test_sdtrig(testcase):
+    run_testcase(
+        module="test_sdtrig",
+        toplevel="core",
+        testcase=testcase,
+        sources=CORE_SOURCES,
+        includes=CORE_INCLUDES,
+        parameters={"START_ADDR": 0, "HART_ID": 0},
+        build_args=BUILD_ARGS,
+    )
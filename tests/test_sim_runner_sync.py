@@ -0,0 +1,174 @@
+"""Check that sim_runner's build settings match the Makefile flows.
+
+sim_runner mirrors the Makefiles' source lists and Verilator flags so the
+*_pytest.py shims build the same model as ``make``. These tests evaluate
+the Makefiles' assignments and fail when the two drift apart. No
+simulator is needed.
+
+Usage (from tests/):
+    pytest test_sim_runner_sync.py
+"""
+import os
+import re
+
+from sim_runner import (
+    MAKEFILE_BUILD_ARGS,
+    MAKEFILE_DEFINES,
+    MAKEFILE_ENV,
+    MAKEFILE_INCLUDES,
+    MAKEFILE_PARAMETERS,
+    MAKEFILE_SOURCES,
+    PROJECT_ROOT,
+    TESTS_DIR,
+    TOP_WITH_RAM_SIM_INCLUDES,
+    TOP_WITH_RAM_SIM_SOURCES,
+    VERILATOR_BUILD_ARGS,
+)
+
+_ASSIGN = re.compile(r"^(?:export\s+)?([A-Za-z_][A-Za-z_0-9]*)\s*(\?=|:=|\+=|=)\s*(.*)$")
+_COND = re.compile(r"^(ifeq|ifneq)\s*\(([^,]*),([^)]*)\)$")
+_RULE = re.compile(r"^[^=\s]+\s*::?(?!=)")
+_REF = re.compile(r"\$\(([A-Za-z_][A-Za-z_0-9]*)\)")
+
+
+def make_vars(makefile, overrides):
+    """Evaluate the variable assignments of tests/<makefile>.
+
+    Handles =, :=, ?= and +=, $(VAR) references, backslash continuations
+    and ifeq/ifneq/else/endif. Variables in overrides behave like
+    command-line assignments. Parsing stops at the first rule or include.
+    """
+    text = (TESTS_DIR / makefile).read_text().replace("\\\n", " ")
+    env = dict(overrides)
+    active = []
+
+    def expand(value):
+        return _REF.sub(lambda m: env.get(m.group(1), ""), value).strip()
+
+    for raw in text.splitlines():
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        cond = _COND.match(line)
+        if cond:
+            equal = expand(cond.group(2)) == expand(cond.group(3))
+            active.append(equal if cond.group(1) == "ifeq" else not equal)
+            continue
+        if line == "else":
+            active[-1] = not active[-1]
+            continue
+        if line == "endif":
+            active.pop()
+            continue
+        if not all(active):
+            continue
+        if line.startswith("include") or _RULE.match(line):
+            break
+        assign = _ASSIGN.match(line)
+        if not assign:
+            continue
+        name, op, value = assign.groups()
+        if name in overrides or (op == "?=" and name in env):
+            continue
+        value = expand(value)
+        if op == "+=" and env.get(name):
+            value = f"{env[name]} {value}"
+        env[name] = value
+    return env
+
+
+def compile_args(env):
+    """Split COMPILE_ARGS into tokens, undoing the Makefiles' \\' escapes."""
+    return env.get("COMPILE_ARGS", "").replace("\\'", "'").split()
+
+
+def expand_sources(value):
+    """Expand a VERILOG_SOURCES value like the shell does."""
+    sources = []
+    for word in value.split():
+        if "*" in word:
+            parent, pattern = word.rsplit("/", 1)
+            sources += [str(p) for p in sorted(PROJECT_ROOT.joinpath(parent).glob(pattern))]
+        else:
+            sources.append(word)
+    return sources
+
+
+def sv_int(literal):
+    """Parse a plain or sized hex SystemVerilog literal such as 32'h106C0."""
+    if "'h" in literal:
+        return int(literal.split("'h", 1)[1].replace("_", ""), 16)
+    return int(literal, 0)
+
+
+def _clint_env():
+    return make_vars("Makefile.clint", {
+        "PROJECT_ROOT": str(PROJECT_ROOT),
+        "SIM": "verilator",
+        "HDL_CLOCK": "0",
+        "SIM_MONITORS": "0",
+        "WAVES": "0",
+    })
+
+
+def test_top_with_ram_sim_sources_match_makefile_clint():
+    env = _clint_env()
+    assert expand_sources(env["VERILOG_SOURCES"]) == \
+        [str(s) for s in TOP_WITH_RAM_SIM_SOURCES]
+
+
+def test_top_with_ram_sim_includes_match_makefile_clint():
+    env = _clint_env()
+    includes = [str(i) for i in TOP_WITH_RAM_SIM_INCLUDES]
+    listed = env["VERILOG_INCLUDE_DIRS"].split()
+    # Makefile.clint also lists $(RTL_DIR)/rtl/core, which does not exist
+    assert [d for d in listed if d in includes] == includes
+
+
+def test_verilator_build_args_match_makefile_clint():
+    args = compile_args(_clint_env())
+    for flag in VERILATOR_BUILD_ARGS:
+        assert flag in args, f"{flag} is not in Makefile.clint COMPILE_ARGS"
+    warnings = {a for a in args if a.startswith("-Wno-")}
+    assert warnings == {a for a in VERILATOR_BUILD_ARGS if a.startswith("-Wno-")}
+
+
+def _makefile_env():
+    overrides = {
+        "PROJECT_ROOT": str(PROJECT_ROOT),
+        "SIM": "verilator",
+        "HDL_CLOCK": "0",
+        "WAVES": "0",
+    }
+    # make picks TOHOST_ADDR up from the environment, as sim_runner does
+    if "TOHOST_ADDR" in os.environ:
+        overrides["TOHOST_ADDR"] = os.environ["TOHOST_ADDR"]
+    return make_vars("Makefile", overrides)
+
+
+def test_makefile_sources_match_makefile():
+    env = _makefile_env()
+    assert expand_sources(env["VERILOG_SOURCES"]) == [str(s) for s in MAKEFILE_SOURCES]
+    assert env["VERILOG_INCLUDE_DIRS"].split() == [str(i) for i in MAKEFILE_INCLUDES]
+
+
+def test_makefile_build_settings_match_makefile():
+    env = _makefile_env()
+    args = compile_args(env)
+    defines = {}
+    parameters = {}
+    build_args = []
+    for arg in args:
+        if arg.startswith("-D"):
+            name, _, value = arg[2:].partition("=")
+            defines[name] = value or 1
+        elif arg.startswith("-G"):
+            name, _, value = arg[2:].partition("=")
+            parameters[name] = sv_int(value)
+        else:
+            build_args.append(arg)
+    assert defines == MAKEFILE_DEFINES
+    assert parameters == MAKEFILE_PARAMETERS
+    assert build_args == MAKEFILE_BUILD_ARGS
+    for name, value in MAKEFILE_ENV.items():
+        assert env.get(name) == value, f"tests/Makefile does not export {name}={value}"
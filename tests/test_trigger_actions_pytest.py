@@ -0,0 +1,34 @@
+"""Run the trigger action cocotb tests from pytest, one simulator run per testcase.
+
+Usage (from tests/):
+    pytest -n auto test_trigger_actions_pytest.py
+"""
+import pytest
+
+from sim_runner import (
+    MAKEFILE_BUILD_ARGS,
+    MAKEFILE_DEFINES,
+    MAKEFILE_ENV,
+    MAKEFILE_INCLUDES,
+    MAKEFILE_PARAMETERS,
+    MAKEFILE_SOURCES,
+    cocotb_testcases,
+    run_testcase,
+)
+
+TESTCASES = cocotb_testcases("test_trigger_actions")
+
+
+@pytest.mark.parametrize("testcase", TESTCASES)
+def test_trigger_actions(testcase):
+    run_testcase(
+        module="test_trigger_actions",
+        toplevel="top_with_ram_sim",
+        testcase=testcase,
+        sources=MAKEFILE_SOURCES,
+        includes=MAKEFILE_INCLUDES,
+        parameters=MAKEFILE_PARAMETERS,
+        defines=MAKEFILE_DEFINES,
+        build_args=MAKEFILE_BUILD_ARGS,
+        extra_env=MAKEFILE_ENV,
+    )